@@ -0,0 +1,278 @@
+"""Time the vocabulary paths that grow with the number of words.
+
+Each benchmark builds synthetic vocabularies of the given sizes in a
+temporary home directory, so ~/.polyglot is never touched:
+
+    python benchmarks/bench_vocabulary.py update --words 1000 50000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Run from a checkout without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from polyglot.controllers.user_controller import UserController
+from polyglot.controllers.vocabulary_controller import VocabularyController
+from polyglot.services.migrations import VOCABULARY_VERSION
+from polyglot.services.vocabulary_storage import (
+    ChangeKind,
+    StorageBackends,
+    VocabularyChange,
+    apply_vocabulary_dtypes,
+    create_vocabulary_storage,
+    pa,
+)
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+
+
+def build_vocabulary(count: int, seed: int = 0) -> pd.DataFrame:
+    """Build a vocabulary of count words, about half of them practiced"""
+    rng = np.random.default_rng(seed)
+    words = [f"word{i}" for i in range(count)]
+    times_practiced = rng.integers(0, 12, count) * (rng.random(count) < 0.5)
+    practiced = times_practiced > 0
+    last_practiced = pd.Timestamp("2024-01-01") + pd.to_timedelta(
+        rng.integers(0, 180 * 24 * 3600, count), unit="s"
+    )
+    interval = rng.uniform(1, 60, count).astype("float32")
+    return apply_vocabulary_dtypes(
+        pd.DataFrame(
+            {
+                "word": words,
+                "translation": [f"translation of {word}" for word in words],
+                "example": [
+                    f"An example sentence with {word} in it." for word in words
+                ],
+                "example_translation": "An example sentence.",
+                "times_practiced": times_practiced,
+                "correct_answers": (times_practiced * rng.random(count)).astype(int),
+                "topic": rng.choice(["Food", "Travel", "Work", "Home"], count),
+                "level": rng.choice(["A1", "A2", "B1", "B2"], count),
+                "sentence_to_fill": "I would like some ___, please.",
+                "sentence_to_fill_translation": "I would like some, please.",
+                "options": [[word, "b", "c", "d"] for word in words],
+                "correct_answer": words,
+                "viewed": practiced,
+                "last_practiced": last_practiced,
+                "interval": np.where(practiced, interval, 0),
+                "ease": 2.5,
+                "due": (last_practiced + pd.to_timedelta(interval, unit="D")).where(
+                    practiced
+                ),
+            }
+        )
+    )
+
+
+def open_controller(home: Path, count: int, backend: str = "csv"):
+    """Store a vocabulary of count words and open it the way the app does"""
+    data_dir = home / ".polyglot"
+    data_dir.mkdir(exist_ok=True)
+    (data_dir / "user_settings.json").write_text(
+        json.dumps(
+            {
+                "native_language": "English",
+                "target_language": "Spanish",
+                "storage_backend": backend,
+            }
+        )
+    )
+    storage = create_vocabulary_storage(backend, data_dir)
+    storage.save(build_vocabulary(count))
+    storage.write_schema_version(VOCABULARY_VERSION)
+
+    user = UserController()
+    controller = VocabularyController(user)
+    # Plan once and stop planning, so the worker does not compete for the GIL
+    controller.planner.worker.flush()
+    controller.planner.close()
+    return user, controller
+
+
+def close_controller(user: UserController, controller: VocabularyController):
+    controller.close()
+    user.close()
+
+
+def time_calls(fn: Callable[[], object], repeat: int) -> List[float]:
+    """Get the seconds each of repeat calls to fn took"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(count: int, name: str, times: List[float]):
+    """Print the median and the slowest 1% of the timings, in milliseconds"""
+    median = statistics.median(times) * 1000
+    p99 = float(np.percentile(times, 99)) * 1000
+    print(f"{count:>9,} words  {name:<40} median {median:9.3f} ms  p99 {p99:9.3f} ms")
+
+
+def bench_update(home: Path, count: int):
+    """Per-answer latency: the stat update after each answer and marking a word as seen"""
+    user, controller = open_controller(home, count)
+    rng = np.random.default_rng(1)
+    words = controller.vocabulary["word"].to_numpy()
+    picks = iter(rng.choice(words, 4000))
+    report(
+        count,
+        "update_word_stats",
+        time_calls(lambda: controller.update_word_stats(next(picks), True), 2000),
+    )
+    report(
+        count,
+        "mark_word_as_viewed",
+        time_calls(lambda: controller.mark_word_as_viewed(next(picks)), 2000),
+    )
+    close_controller(user, controller)
+
+
+def load_storage(backend: str, data_dir: Path) -> pd.DataFrame:
+    """Load a vocabulary with a fresh storage, as load_vocabulary() does at startup"""
+    return apply_vocabulary_dtypes(create_vocabulary_storage(backend, data_dir).load())
+
+
+def bench_load(home: Path, count: int):
+    """Startup load of each storage: the first load, then the best of five more"""
+    vocabulary = build_vocabulary(count)
+    for backend in StorageBackends:
+        if backend == StorageBackends.ARROW and pa is None:
+            print(f"{count:>9,} words  load {backend.value:<35} skipped, needs pyarrow")
+            continue
+        data_dir = home / backend.value
+        data_dir.mkdir()
+        create_vocabulary_storage(backend.value, data_dir).save(vocabulary)
+        times = time_calls(partial(load_storage, backend.value, data_dir), 6)
+        print(
+            f"{count:>9,} words  load {backend.value:<35} "
+            f"first  {times[0] * 1000:9.1f} ms  best {min(times[1:]) * 1000:9.1f} ms"
+        )
+
+
+def peak_memory(fn: Callable[[], object]) -> float:
+    """Get the peak Python memory fn allocated, in MB; Arrow buffers are not counted"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def bench_save(home: Path, count: int):
+    """Full snapshot saves with their peak memory, and a flush of 100 answers"""
+    vocabulary = build_vocabulary(count)
+    size = vocabulary.memory_usage(deep=True).sum() / 2**20
+    print(f"{count:>9,} words  in memory {size:.1f} MB")
+    # The stats records update_word_stats() queues, for 100 answers
+    answers = [
+        VocabularyChange(
+            ChangeKind.UPDATE,
+            {
+                "word": f"word{row}",
+                "times_practiced": 3,
+                "correct_answers": 2,
+                "viewed": True,
+                "last_practiced": "2024-07-01T10:00:00",
+                "interval": 6.0,
+                "ease": 2.5,
+                "due": "2024-07-07T10:00:00",
+            },
+        )
+        for row in np.random.default_rng(2).choice(count, 100)
+    ]
+    for backend in StorageBackends:
+        if backend == StorageBackends.ARROW and pa is None:
+            print(f"{count:>9,} words  save {backend.value:<35} skipped, needs pyarrow")
+            continue
+        data_dir = home / backend.value
+        data_dir.mkdir()
+        storage = create_vocabulary_storage(backend.value, data_dir)
+
+        save = min(time_calls(partial(storage.save, vocabulary), 3))
+        peak = peak_memory(partial(storage.save, vocabulary))
+        storage.load()
+        flush = min(time_calls(partial(storage.write_changes, None, answers), 3))
+        print(
+            f"{count:>9,} words  save {backend.value:<35} "
+            f"{save * 1000:9.1f} ms  peak {peak:6.1f} MB  "
+            f"100 answers {flush * 1000:7.1f} ms"
+        )
+
+
+def bench_select(home: Path, count: int):
+    """Word selection for each kind of session, with the app's default session sizes"""
+    user, controller = open_controller(home, count)
+    selectors = {
+        "get_daily_words(5)": partial(controller.get_daily_words, 5),
+        "get_flashcard_words(10)": partial(controller.get_flashcard_words, 10),
+        "get_test_words(10)": partial(controller.get_test_words, 10),
+        "get_due_words(10)": partial(controller.get_due_words, 10),
+        "get_translation_practice_sentences(10)": partial(
+            controller.get_translation_practice_sentences, 10
+        ),
+    }
+    for name, select in selectors.items():
+        # The first call may build a lazy index; time the calls after it
+        select()
+        report(count, name, time_calls(select, 50))
+    close_controller(user, controller)
+
+
+BENCHMARKS: Dict[str, Callable[[Path, int], None]] = {
+    "update": bench_update,
+    "load": bench_load,
+    "save": bench_save,
+    "select": bench_select,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="benchmark",
+        help=f"{', '.join(BENCHMARKS)} (default: all)",
+    )
+    parser.add_argument(
+        "--words",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="vocabulary sizes (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"== {name}")
+        for count in args.words:
+            # A fresh home per run, so files from larger runs are never reused
+            with tempfile.TemporaryDirectory() as home:
+                os.environ["HOME"] = home
+                os.environ.pop("OPENAI_API_KEY", None)
+                BENCHMARKS[name](Path(home), count)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from polyglot.views.sentence_translation_view import SentenceTranslationView
 from polyglot.views.progress_view import ProgressView
 from polyglot.views.settings_view import SettingsView
 from polyglot.views.add_word_view import AddWordView
+from polyglot.services.async_loop import TkAsyncLoop
 
 from dotenv import load_dotenv
 
@@ -33,6 +34,9 @@ class PolyglotApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
+        # LLM requests run as coroutines on an asyncio loop stepped by Tk
+        self.async_loop = TkAsyncLoop(self)
+
         # Initialize controllers
         self.user_controller = UserController()
         self.vocabulary_controller = VocabularyController(self.user_controller)
@@ -45,8 +49,18 @@ class PolyglotApp(ctk.CTk):
         self.data_dir = Path.home() / ".polyglot"
         self.data_dir.mkdir(exist_ok=True)
 
+        # Write pending changes to disk before the window closes
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.initialize_app()
 
+    def on_close(self):
+        """Flush pending data and close the application"""
+        self.async_loop.close()
+        self.vocabulary_controller.close()
+        self.user_controller.close()
+        self.destroy()
+
     def initialize_app(self):
         """Initialize the application based on user data existence"""
         if not self.user_controller.user_exists():
@@ -62,15 +76,24 @@ class PolyglotApp(ctk.CTk):
         if self.vocabulary_controller.needs_new_words(min_unpracticed=5):
             settings = self.user_controller.get_settings()
 
-            new_words = self.vocabulary_controller.generate_words(
-                native_lang=settings["native_language"],
-                target_lang=settings["target_language"],
-                level=settings["level"],
-                topics=settings["topics"],
-                include_phrases=settings["include_phrases"],
+            # Generate in the background; the menu is usable in the meantime
+            self.async_loop.submit(
+                self.vocabulary_controller.generate_words_async(
+                    native_lang=settings["native_language"],
+                    target_lang=settings["target_language"],
+                    level=settings["level"],
+                    topics=settings["topics"],
+                    include_phrases=settings["include_phrases"],
+                ),
+                on_done=self.add_daily_words,
+                on_error=lambda e: print(f"Error generating daily words: {e}"),
             )
 
-            self.vocabulary_controller.add_words(new_words)
+    def add_daily_words(self, words):
+        """Add generated words and refresh the menu's word count"""
+        self.vocabulary_controller.add_words(words)
+        if "menu" in self.views:
+            self.views["menu"].update_word_count()
 
     def show_view(self, view_type: str):
         """Show a specific view"""
@@ -1,19 +1,38 @@
 import json
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
+
+from polyglot.services.migrations import SETTINGS_VERSION, migrate_settings
+from polyglot.services.persistence_worker import PersistenceWorker, atomic_path
 
 
 class UserController:
     def __init__(self):
         self.data_dir = Path.home() / ".polyglot"
         self.user_file = self.data_dir / "user_settings.json"
+
+        # Settings are written to disk by a background worker
+        self._lock = threading.Lock()
+        self._pending_settings: Optional[str] = None
+        self.persistence = PersistenceWorker(self._write_pending_settings)
+
+        # Called with the changed settings after each update_settings()
+        self._settings_listeners: List[Callable[[Dict], None]] = []
+
         self.load_settings()
 
     def load_settings(self):
-        """Load user settings from JSON file"""
+        """Load user settings from JSON file, migrating outdated settings once"""
         if self.user_file.exists():
             with open(self.user_file, "r") as f:
                 self.settings = json.load(f)
+
+            # Files from before versioning have no schema_version
+            version = self.settings.get("schema_version", 0)
+            if version < SETTINGS_VERSION:
+                self.settings = migrate_settings(self.settings, version)
+                self.save_settings()
         else:
             self.settings = {
                 "native_language": None,
@@ -26,16 +45,49 @@ class UserController:
                 "test_word_count": 10,
                 "min_practice_count": 7,  # Minimum practices to consider a word learnt
                 "min_success_rate": 75,  # Minimum success rate (%) to consider a word learnt
+                "storage_backend": "csv",  # Vocabulary storage: "csv", "sqlite" or "arrow"
+                "selection_strategy": "balanced",  # Word selection: "balanced" or "spaced_repetition"
+                "translation_grading": "each",  # Translation checks: "each" or "at_end"
+                "strip_articles": False,  # Ignore leading articles in duplicates and answers
+                "schema_version": SETTINGS_VERSION,
             }
 
     def save_settings(self):
-        """Save user settings to JSON file"""
-        with open(self.user_file, "w") as f:
-            json.dump(self.settings, f)
+        """Schedule a write of the user settings to the JSON file"""
+        settings = json.dumps(self.settings)
+        with self._lock:
+            self._pending_settings = settings
+        self.persistence.mark_dirty()
+
+    def _write_pending_settings(self):
+        """Write the latest settings; runs on the persistence worker"""
+        with self._lock:
+            settings, self._pending_settings = self._pending_settings, None
+        if settings is None:
+            return
+        try:
+            self.data_dir.mkdir(exist_ok=True)
+            with atomic_path(self.user_file) as tmp_path:
+                tmp_path.write_text(settings)
+        except Exception:
+            # Keep the settings so the next flush retries them, unless newer
+            # settings were saved in the meantime
+            with self._lock:
+                if self._pending_settings is None:
+                    self._pending_settings = settings
+            raise
+
+    def flush(self):
+        """Write pending settings to disk now"""
+        self.persistence.flush()
+
+    def close(self):
+        """Flush pending settings and stop the persistence worker"""
+        self.persistence.stop()
 
     def user_exists(self) -> bool:
         """Check if user settings exist"""
-        return self.user_file.exists()
+        return self.user_file.exists() or self._pending_settings is not None
 
     def create_user(
         self,
@@ -61,6 +113,12 @@ class UserController:
         """Update user settings"""
         self.settings.update(settings)
         self.save_settings()
+        for listener in self._settings_listeners:
+            listener(settings)
+
+    def add_settings_listener(self, listener: Callable[[Dict], None]):
+        """Register a callback for settings changed with update_settings()"""
+        self._settings_listeners.append(listener)
 
     def get_settings(self) -> Dict:
         """Get current user settings"""
@@ -69,24 +127,44 @@ class UserController:
     @property
     def words_per_day(self) -> int:
         """Get number of words per day setting"""
-        return self.settings.get("words_per_day", 5)
+        return self.settings["words_per_day"]
 
     @property
     def flashcard_delay(self) -> int:
         """Get flashcard delay in seconds"""
-        return self.settings.get("flashcard_delay", 5)
+        return self.settings["flashcard_delay"]
 
     @property
     def test_word_count(self) -> int:
         """Get number of words for testing"""
-        return self.settings.get("test_word_count", 10)
+        return self.settings["test_word_count"]
 
     @property
     def min_practice_count(self) -> int:
         """Get minimum number of practices to consider a word learnt"""
-        return self.settings.get("min_practice_count", 7)
+        return self.settings["min_practice_count"]
 
     @property
     def min_success_rate(self) -> float:
         """Get minimum success rate (%) to consider a word learnt"""
-        return self.settings.get("min_success_rate", 75)
+        return self.settings["min_success_rate"]
+
+    @property
+    def storage_backend(self) -> str:
+        """Get the vocabulary storage backend"""
+        return self.settings["storage_backend"]
+
+    @property
+    def selection_strategy(self) -> str:
+        """Get the strategy used to pick words for tests and translation practice"""
+        return self.settings["selection_strategy"]
+
+    @property
+    def translation_grading(self) -> str:
+        """Get when sentence translations are checked: after each one or all at the end"""
+        return self.settings["translation_grading"]
+
+    @property
+    def strip_articles(self) -> bool:
+        """Check if words differing only in a leading article count as the same word"""
+        return self.settings["strip_articles"]
@@ -1,13 +1,59 @@
+import numpy as np
 import pandas as pd
 import json
 from pathlib import Path
 import os
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from pydantic import BaseModel
-from datetime import datetime
-
-from polyglot.services.llm_provider import OpenAIProvider, LlmChatCompletionResponse
+from datetime import datetime, timedelta
+from enum import Enum
+
+from polyglot.services.distractors import DistractorIndex
+from polyglot.services.edit_distance import BKTree, near_duplicate_distance
+from polyglot.services.llm_cache import (
+    CachedAsyncLlmProvider,
+    CachedLlmProvider,
+    LlmResponseCache,
+)
+from polyglot.services.llm_provider import (
+    AsyncOpenAIProvider,
+    LlmChatCompletionResponse,
+    OpenAIProvider,
+)
+from polyglot.services.llm_resilience import (
+    RateLimiter,
+    ResilientAsyncLlmProvider,
+    ResilientLlmProvider,
+)
 from polyglot.controllers.user_controller import UserController
+from polyglot.services.migrations import VOCABULARY_VERSION, migrate_vocabulary
+from polyglot.services.normalization import normalize_word
+from polyglot.services.persistence_worker import PersistenceWorker
+from polyglot.services.progress import (
+    LearningStatus,
+    learning_statuses,
+    success_rates,
+)
+from polyglot.services.scheduler import (
+    DEFAULT_EASE,
+    DueQueue,
+    SelectionStrategies,
+    sm2_review,
+)
+from polyglot.services.session_planner import SessionKinds, SessionPlanner
+from polyglot.services.vocabulary_storage import (
+    CATEGORY_COLUMNS,
+    DETAIL_COLUMNS,
+    STAT_COLUMNS,
+    SUMMARY_COLUMNS,
+    VOCABULARY_COLUMNS,
+    ChangeKind,
+    VocabularyChange,
+    apply_vocabulary_dtypes,
+    create_vocabulary_storage,
+)
 
 
 class WordResponse(BaseModel):
@@ -32,135 +78,559 @@ class TranslationCheckResponse(BaseModel):
     comment: str
 
 
+class NumberedTranslationCheck(BaseModel):
+    number: int
+    is_correct: bool
+    comment: str
+
+
+class TranslationChecks(BaseModel):
+    checks: List[NumberedTranslationCheck]
+
+
+class TranslationGradingModes(Enum):
+    # Check each translation as soon as it is entered
+    EACH = "each"
+    # Check all the translations of a session in one request at its end
+    AT_END = "at_end"
+
+
+# Settings that change which words the planned sessions get
+PLAN_SETTINGS = ["words_per_day", "test_word_count", "selection_strategy"]
+# Columns the session selection reads, copied for the planner
+PLAN_COLUMNS = [
+    "word",
+    "times_practiced",
+    "viewed",
+    "last_practiced",
+    "due",
+    "success_rate",
+]
+# Sentences per translation practice session
+TRANSLATION_SENTENCE_COUNT = 5
+# Test options spelled within this many edits of the answer, to make tests harder
+CONFUSABLE_DISTRACTORS = 1
+CONFUSABLE_DISTANCE = 1
+# Largest batch add_words() checks for near-duplicates; bulk imports skip the
+# check so they never build the edit index or search it word by word
+MAX_NEAR_DUPLICATE_BATCH = 20
+# Words whose details lazy storages keep in memory after showing them
+DETAILS_CACHE_SIZE = 1000
+# Words returned by generate_words(), and the extra words requested to make up
+# for generated words that turn out to be duplicates
+WORDS_PER_GENERATION = 15
+GENERATION_OVERSHOOT = 5
+# Existing words listed in a generation prompt, most relevant first
+MAX_EXCLUDED_WORDS = 150
+LLM_MODEL = "gpt-4o-2024-08-06"
+# Cached LLM responses older than this are requested again
+LLM_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+# LLM requests the async provider keeps in flight at once
+LLM_MAX_CONCURRENCY = 4
+# Client-side limits kept below the API's rate limits, so bursts are spread
+# out instead of answered with 429s
+LLM_REQUESTS_PER_MINUTE = 450
+LLM_TOKENS_PER_MINUTE = 27000
+# Completion tokens allowed per translation in a batched check
+TRANSLATION_CHECK_TOKENS = 250
+
+
+def _smallest(keys: np.ndarray, count: int) -> np.ndarray:
+    """Get the positions of the count smallest keys, in no particular order"""
+    count = max(0, min(count, len(keys)))
+    if count == len(keys):
+        return np.arange(count)
+    # Partial selection is O(n) where sorting all keys would be O(n log n)
+    return np.argpartition(keys, count - 1)[:count] if count else np.arange(0)
+
+
+def _category_value(value):
+    """Get a topic or level as a hashable key, with None for missing values"""
+    return None if pd.isna(value) else value
+
+
+def _timestamp_keys(timestamps: pd.Series) -> np.ndarray:
+    """Get timestamps as integer sort keys, with missing ones sorting last"""
+    keys = timestamps.to_numpy("datetime64[ns]").view("int64")
+    return np.where(timestamps.isna().to_numpy(), np.iinfo(np.int64).max, keys)
+
+
+def _scheduled_due_labels(vocabulary: pd.DataFrame, count: int) -> pd.Index:
+    """Get the labels of the count words due first in vocabulary, most overdue first"""
+    # The review queue follows the live vocabulary, so a copy is searched directly
+    scheduled = np.flatnonzero(vocabulary["due"].notna().to_numpy())
+    keys = _timestamp_keys(vocabulary["due"].iloc[scheduled])
+    selected = _smallest(keys, count)
+    selected = selected[np.argsort(keys[selected], kind="stable")]
+    return vocabulary.index[scheduled[selected]]
+
+
 class VocabularyController:
     def __init__(self, user_controller: UserController):
         self.data_dir = Path.home() / ".polyglot"
-        self.vocab_file = self.data_dir / "vocabulary.csv"
         self.user_controller = user_controller
+        self.storage = create_vocabulary_storage(
+            user_controller.storage_backend, self.data_dir
+        )
+        # Lazy storages keep the detail columns out of the vocabulary DataFrame;
+        # details of recently shown words are cached here by word, and those
+        # of added words are kept until the storage has them
+        self._details: "OrderedDict[str, Dict]" = OrderedDict()
+        self._unsaved_details: Dict[str, Dict] = {}
+        # Review queue for spaced repetition, built on first use
+        self._due_queue: Optional[DueQueue] = None
+        # Test distractors by topic and level, built on first use
+        self._distractor_index: Optional[DistractorIndex] = None
+        # Edit distance index of the words, built by the session planner's
+        # worker; the UI thread never builds it
+        self._edit_index: Optional[BKTree] = None
+        # Normalized word -> stored word, for duplicate checks; built on first use
+        self._normalized_words: Optional[Dict[str, str]] = None
+        self._normalization_settings = self._current_normalization_settings()
+        # Bumped whenever the words or their keys change, so indexes built off
+        # the lock from an older copy of the words are thrown away
+        self._words_version = 0
         self.load_vocabulary()
+        # Learning statuses depend on the thresholds in the settings
+        user_controller.add_settings_listener(self._on_settings_changed)
+
+        # Changes are written to disk by a background worker, never by the UI thread
+        self._lock = threading.RLock()
+        self._pending_changes: List[VocabularyChange] = []
+        self.persistence = PersistenceWorker(self._write_pending_changes)
+
+        # Words of the next sessions are selected in the background
+        self.planner = SessionPlanner(
+            self.data_dir / "session_plan.json",
+            self._plan_snapshot,
+            self._plan_session,
+            self._plan_fingerprint,
+            self._lock,
+            warm_fn=self._warm_indexes,
+        )
 
         # Initialize OpenAI provider
         self.api_key = os.getenv("OPENAI_API_KEY")
         if self.api_key:
-            self.llm_provider = OpenAIProvider(
-                api_key=self.api_key, model="gpt-4o-2024-08-06"
+            # Repeated requests, like checking the same translation again, are
+            # answered from ~/.polyglot/llm_cache.sqlite
+            self.llm_cache = LlmResponseCache(
+                self.data_dir / "llm_cache.sqlite", ttl_seconds=LLM_CACHE_TTL_SECONDS
+            )
+            # Requests that miss the cache are throttled and retried with backoff;
+            # the client's own retries are off so they do not stack
+            self.llm_limiter = RateLimiter(
+                LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+            )
+            self.llm_provider = CachedLlmProvider(
+                ResilientLlmProvider(
+                    OpenAIProvider(
+                        api_key=self.api_key, model=LLM_MODEL, max_retries=0
+                    ),
+                    self.llm_limiter,
+                ),
+                self.llm_cache,
+            )
+            # The *_async methods share the cache and limits but let several
+            # requests run at once
+            self.async_llm_provider = CachedAsyncLlmProvider(
+                ResilientAsyncLlmProvider(
+                    AsyncOpenAIProvider(
+                        api_key=self.api_key,
+                        model=LLM_MODEL,
+                        max_concurrency=LLM_MAX_CONCURRENCY,
+                        max_retries=0,
+                    ),
+                    self.llm_limiter,
+                ),
+                self.llm_cache,
             )
 
     def load_vocabulary(self):
-        """Load vocabulary from CSV file"""
-        if self.vocab_file.exists():
+        """Load vocabulary from the configured storage, migrating outdated data once"""
+        if self.storage.exists():
             try:
-                # First load with minimal type specifications to avoid NA errors
-                self.vocabulary = pd.read_csv(self.vocab_file)
-
-                # Convert options in a vectorized way if present
-                if "options" in self.vocabulary.columns:
-                    # Check if options column is string type before applying eval
-                    self.vocabulary["options"] = self.vocabulary["options"].apply(
-                        lambda x: eval(x) if isinstance(x, str) else x
-                    )
-
-                # Initialize or convert last_practiced
-                if "last_practiced" not in self.vocabulary.columns:
-                    self.vocabulary["last_practiced"] = datetime.now()
-                else:
-                    # Convert string dates to datetime objects
-                    try:
-                        self.vocabulary["last_practiced"] = pd.to_datetime(
-                            self.vocabulary["last_practiced"], errors="coerce"
-                        )
-                        # Fill NaN values with current datetime (fixed to avoid FutureWarning)
-                        mask = self.vocabulary["last_practiced"].isna()
-                        self.vocabulary.loc[mask, "last_practiced"] = datetime.now()
-                    except Exception:
-                        # If conversion fails, set to current datetime
-                        self.vocabulary["last_practiced"] = datetime.now()
-
-                # Ensure required columns exist with default values
-                required_columns = {
-                    "correct_answers": 0,
-                    "times_practiced": 0,
-                    "viewed": False,
-                }
+                self.vocabulary = self.storage.load()
 
-                for col, default in required_columns.items():
-                    if col not in self.vocabulary.columns:
-                        self.vocabulary[col] = default
-                    elif self.vocabulary[col].isnull().any():
-                        # Use .loc instead of fillna with inplace=True
-                        mask = self.vocabulary[col].isnull()
-                        self.vocabulary.loc[mask, col] = default
-
-                # Convert integer columns after filling NAs
-                integer_columns = ["times_practiced", "correct_answers"]
-                for col in integer_columns:
-                    if col in self.vocabulary.columns:
-                        self.vocabulary[col] = self.vocabulary[col].astype(int)
-
-                # Convert boolean columns
-                if "viewed" in self.vocabulary.columns:
-                    self.vocabulary["viewed"] = self.vocabulary["viewed"].astype(bool)
+                version = self.storage.read_schema_version()
+                if version < VOCABULARY_VERSION:
+                    self.vocabulary = apply_vocabulary_dtypes(
+                        migrate_vocabulary(self.vocabulary, version)
+                    )
+                    self.storage.save(self.vocabulary)
+                    self.storage.write_schema_version(VOCABULARY_VERSION)
 
             except Exception as e:
                 print(f"Error loading vocabulary: {e}")
                 # Create a new empty vocabulary as fallback
-                self.vocabulary = pd.DataFrame(
-                    columns=[
-                        "word",
-                        "translation",
-                        "example",
-                        "example_translation",
-                        "times_practiced",
-                        "correct_answers",
-                        "topic",
-                        "level",
-                        "sentence_to_fill",
-                        "sentence_to_fill_translation",
-                        "options",
-                        "correct_answer",
-                        "viewed",
-                        "last_practiced",
-                    ]
-                )
+                self.vocabulary = pd.DataFrame(columns=self._loaded_columns)
         else:
             # Create empty DataFrame with all required columns
-            self.vocabulary = pd.DataFrame(
-                columns=[
-                    "word",
-                    "translation",
-                    "example",
-                    "example_translation",
-                    "times_practiced",
-                    "correct_answers",
-                    "topic",
-                    "level",
-                    "sentence_to_fill",
-                    "sentence_to_fill_translation",
-                    "options",
-                    "correct_answer",
-                    "viewed",
-                    "last_practiced",
-                ]
-            )
+            self.vocabulary = pd.DataFrame(columns=self._loaded_columns)
+            self.storage.write_schema_version(VOCABULARY_VERSION)
+
+        self.vocabulary = apply_vocabulary_dtypes(self.vocabulary)
+        self._rebuild_word_index()
+        self._due_queue = None
+        self._distractor_index = None
+        self._edit_index = None
+        self._normalized_words = None
+        self._words_version += 1
+        self._refresh_progress()
+
+    @property
+    def _loaded_columns(self) -> List[str]:
+        """Columns kept in the vocabulary DataFrame"""
+        return SUMMARY_COLUMNS if self.storage.lazy_details else VOCABULARY_COLUMNS
+
+    def _rebuild_word_index(self):
+        """Rebuild the word -> row index used for per-word lookups"""
+        # Iterate backwards so the first row wins if a word is duplicated
+        self._word_index = dict(
+            zip(self.vocabulary["word"].values[::-1], self.vocabulary.index[::-1])
+        )
+
+    def _refresh_progress(self):
+        """Recompute success rates, learning statuses and their counts in one pass"""
+        times_practiced = self.vocabulary["times_practiced"].to_numpy()
+        correct_answers = self.vocabulary["correct_answers"].to_numpy()
+        self._progress_thresholds = (
+            self.user_controller.min_practice_count,
+            self.user_controller.min_success_rate,
+        )
+        # Derived in memory and kept up to date by every change; never stored
+        self.vocabulary["success_rate"] = success_rates(
+            times_practiced, correct_answers
+        )
+        self.vocabulary["learning_status"] = learning_statuses(
+            times_practiced, correct_answers, *self._progress_thresholds
+        )
+        self._status_counts = np.bincount(
+            self.vocabulary["learning_status"], minlength=len(LearningStatus)
+        ).tolist()
+        self._success_rate_sum = float(self.vocabulary["success_rate"].sum())
+
+    def _update_progress(self, idx):
+        """Update the success rate and learning status of a single word"""
+        times_practiced = int(self.vocabulary.at[idx, "times_practiced"])
+        correct_answers = int(self.vocabulary.at[idx, "correct_answers"])
+        success_rate = correct_answers / times_practiced if times_practiced else 0.0
+        status = learning_statuses(
+            np.array([times_practiced]),
+            np.array([correct_answers]),
+            *self._progress_thresholds,
+        )[0]
+
+        self._status_counts[self.vocabulary.at[idx, "learning_status"]] -= 1
+        self._status_counts[status] += 1
+        self._success_rate_sum += success_rate - float(
+            self.vocabulary.at[idx, "success_rate"]
+        )
+        self.vocabulary.at[idx, "success_rate"] = success_rate
+        self.vocabulary.at[idx, "learning_status"] = status
+
+    def get_success_rates(self) -> np.ndarray:
+        """Get each word's share of correct answers, in vocabulary order"""
+        # Maintained by every answer, so reading it never recomputes anything
+        return self.vocabulary["success_rate"].to_numpy()
+
+    def _low_practice_keys(self, vocabulary: pd.DataFrame) -> np.ndarray:
+        """Get sort keys ordering words by times_practiced, then success rate"""
+        # A success rate adds less than one practice, so it only breaks ties
+        return (
+            vocabulary["times_practiced"].to_numpy()
+            + vocabulary["success_rate"].to_numpy() / 2
+        )
+
+    def _on_settings_changed(self, settings: Dict):
+        """Recompute learning statuses when the learnt thresholds change"""
+        thresholds = (
+            self.user_controller.min_practice_count,
+            self.user_controller.min_success_rate,
+        )
+        if thresholds != self._progress_thresholds:
+            with self._lock:
+                self._refresh_progress()
+        normalization_settings = self._current_normalization_settings()
+        if normalization_settings != self._normalization_settings:
+            # Which leading articles are dropped depends on the language
+            with self._lock:
+                self._normalization_settings = normalization_settings
+                self._normalized_words = None
+                self._words_version += 1
+        self.planner.invalidate()
+
+    def find_word(self, word: str) -> Optional[int]:
+        """Get the row index of a word, or None if it is not in the vocabulary"""
+        return self._word_index.get(word)
+
+    def _current_normalization_settings(self) -> Tuple:
+        """Get the settings the normalized words depend on"""
+        return (
+            self.user_controller.settings.get("target_language"),
+            self.user_controller.strip_articles,
+        )
+
+    def normalize_word(self, word: str) -> str:
+        """Get the key of a word in the target language, shared by its case and Unicode variants, and article variants if enabled"""
+        return normalize_word(
+            word,
+            self.user_controller.settings.get("target_language"),
+            self.user_controller.strip_articles,
+        )
+
+    def _get_normalized_words(self) -> Dict[str, str]:
+        """Get the normalized word -> word index, building it from the vocabulary on first use"""
+        if self._normalized_words is None:
+            normalized_words = {}
+            for word in self.vocabulary["word"]:
+                normalized_words.setdefault(self.normalize_word(word), word)
+            self._normalized_words = normalized_words
+        return self._normalized_words
+
+    def find_duplicate(self, word: str) -> Optional[str]:
+        """Get the vocabulary word that is the same as word up to normalization, if any"""
+        with self._lock:
+            return self._get_normalized_words().get(self.normalize_word(word))
+
+    def get_word_details(self, words: List[str]) -> pd.DataFrame:
+        """Get the detail columns of the given words, indexed by word"""
+        if not self.storage.lazy_details:
+            rows = [
+                self._word_index[word] for word in words if word in self._word_index
+            ]
+            return self.vocabulary.loc[rows].set_index("word")[DETAIL_COLUMNS]
+
+        details = {}
+        with self._lock:
+            for word in words:
+                if word in self._unsaved_details:
+                    details[word] = self._unsaved_details[word]
+                elif word in self._details:
+                    self._details.move_to_end(word)
+                    details[word] = self._details[word]
+        missing = [word for word in words if word not in details]
+        if missing:
+            # Read from the storage without blocking the persistence worker
+            loaded = self.storage.load_details(missing)[DETAIL_COLUMNS].to_dict("index")
+            details.update(loaded)
+            with self._lock:
+                self._cache_details(loaded)
+        return pd.DataFrame.from_dict(
+            {word: details[word] for word in words if word in details},
+            orient="index",
+            columns=DETAIL_COLUMNS,
+        )
+
+    def _cache_details(self, details: Dict[str, Dict]):
+        """Cache loaded details, evicting the least recently shown words"""
+        for word, row in details.items():
+            self._details[word] = row
+            self._details.move_to_end(word)
+        while len(self._details) > DETAILS_CACHE_SIZE:
+            self._details.popitem(last=False)
+
+    def _with_details(self, words: pd.DataFrame) -> pd.DataFrame:
+        """Attach the detail columns to words selected for a view"""
+        if words.empty or not self.storage.lazy_details:
+            return words
+        return words.join(self.get_word_details(words["word"].tolist()), on="word")
 
     def save_vocabulary(self):
-        """Save vocabulary to CSV file"""
-        # Create a copy for saving to avoid modifying the original
-        vocab_to_save = self.vocabulary.copy()
-
-        # Process options columns efficiently
-        if "options" in vocab_to_save.columns:
-            vocab_to_save["options"] = vocab_to_save["options"].apply(str)
-
-        # Convert datetime objects to ISO format strings for saving
-        if "last_practiced" in vocab_to_save.columns:
-            # Handle different data types that might exist in the column
-            vocab_to_save["last_practiced"] = vocab_to_save["last_practiced"].apply(
-                lambda x: x.isoformat() if hasattr(x, "isoformat") else str(x)
+        """Schedule a write of the whole vocabulary"""
+        self._queue_change(VocabularyChange(ChangeKind.SAVE))
+
+    def flush(self):
+        """Write all pending vocabulary changes to disk now"""
+        self.persistence.flush()
+
+    def close(self):
+        """Store the session plan, flush pending changes and stop the workers"""
+        self.planner.close()
+        self.persistence.stop()
+        if self.api_key:
+            self.llm_cache.close()
+
+    def _queue_change(self, change: VocabularyChange):
+        """Queue a change for the persistence worker"""
+        with self._lock:
+            self._pending_changes.append(change)
+        self.persistence.mark_dirty()
+        # Every change can affect which words the next sessions get
+        self.planner.invalidate()
+
+    def get_session_words(self, session: SessionKinds) -> pd.DataFrame:
+        """Get the words of a practice session, using the background plan when it is ready"""
+        words = self.planner.take(session)
+        if words is None:
+            return self._select_session_words(session)
+        with self._lock:
+            rows = [
+                self._word_index[word] for word in words if word in self._word_index
+            ]
+            selected = self.vocabulary.loc[rows]
+        # Details may come from disk, so they are read after releasing the lock
+        return self._with_details(selected)
+
+    def _select_session_words(self, session: SessionKinds) -> pd.DataFrame:
+        """Select the words of a practice session now"""
+        if session == SessionKinds.FLASHCARDS:
+            return self.get_flashcard_words(count=self.user_controller.words_per_day)
+        if session == SessionKinds.TRANSLATION:
+            return self.get_translation_practice_sentences(TRANSLATION_SENTENCE_COUNT)
+        return self.get_test_words(count=self.user_controller.test_word_count)
+
+    def _session_labels(
+        self, session: SessionKinds, vocabulary: pd.DataFrame, due_labels
+    ) -> pd.Index:
+        """Get the row labels of a session's words in vocabulary, with due_labels(count) for reviews"""
+        if session == SessionKinds.FLASHCARDS:
+            return self._flashcard_labels(
+                vocabulary, self.user_controller.words_per_day
+            )
+        if session == SessionKinds.TRANSLATION:
+            return self._translation_labels(
+                vocabulary, TRANSLATION_SENTENCE_COUNT, due_labels
             )
+        return self._test_labels(
+            vocabulary, self.user_controller.test_word_count, due_labels
+        )
 
-        # Use efficient CSV writing
-        vocab_to_save.to_csv(self.vocab_file, index=False)
+    def _plan_snapshot(self) -> pd.DataFrame:
+        """Copy what the session selection reads; call with the lock held"""
+        # A real copy, since practice updates the stat columns in place
+        return self.vocabulary[PLAN_COLUMNS].copy()
+
+    def _plan_session(self, session: SessionKinds, snapshot: pd.DataFrame) -> List[str]:
+        """Select the words of a practice session for the planner, without the lock"""
+        labels = self._session_labels(
+            session,
+            snapshot,
+            lambda count: _scheduled_due_labels(snapshot, count),
+        )
+        return snapshot.loc[labels, "word"].tolist()
+
+    def _warm_indexes(self):
+        """Build missing lookup indexes off the lock and publish them if the words did not change meanwhile"""
+        with self._lock:
+            version = self._words_version
+            build_distractors = self._distractor_index is None
+            build_edit = self._edit_index is None
+            build_normalized = self._normalized_words is None
+            if not (build_distractors or build_edit or build_normalized):
+                return
+            words = self.vocabulary["word"].tolist()
+            topics = self._category_values(self.vocabulary, "topic")
+            levels = self._category_values(self.vocabulary, "level")
+
+        distractor_index = edit_index = normalized_words = None
+        if build_distractors:
+            distractor_index = DistractorIndex()
+            distractor_index.rebuild(words, topics, levels)
+        if build_edit:
+            edit_index = BKTree()
+            edit_index.rebuild(words)
+        if build_normalized:
+            normalized_words = {}
+            for word in words:
+                normalized_words.setdefault(self.normalize_word(word), word)
+
+        with self._lock:
+            if self._words_version != version:
+                return
+            # The UI thread may have built the cheap ones on demand meanwhile
+            if self._distractor_index is None:
+                self._distractor_index = distractor_index
+            if self._edit_index is None:
+                self._edit_index = edit_index
+            if self._normalized_words is None:
+                self._normalized_words = normalized_words
+
+    def _plan_fingerprint(self, vocabulary: pd.DataFrame) -> Dict:
+        """Summarize the data session plans depend on, to tell if a stored plan is still valid"""
+        # Every practice, view or added word changes at least one of these
+        last_practiced = vocabulary["last_practiced"].max()
+        return {
+            "words": len(vocabulary),
+            "times_practiced": int(vocabulary["times_practiced"].sum()),
+            "viewed": int(vocabulary["viewed"].sum()),
+            "last_practiced": last_practiced.isoformat()
+            if pd.notna(last_practiced)
+            else None,
+            "settings": {
+                key: self.user_controller.settings.get(key) for key in PLAN_SETTINGS
+            },
+        }
+
+    def _write_pending_changes(self):
+        """Write queued changes to the storage; runs on the persistence worker"""
+        with self._lock:
+            changes, self._pending_changes = self._pending_changes, []
+            if not changes:
+                return
+            vocabulary = (
+                self._snapshot_vocabulary()
+                if self.storage.needs_snapshot(changes)
+                else None
+            )
+
+        try:
+            self.storage.write_changes(vocabulary, changes)
+        except Exception:
+            # Keep the changes so the next flush retries them
+            with self._lock:
+                self._pending_changes[:0] = changes
+            raise
+
+        if self.storage.lazy_details:
+            with self._lock:
+                self._forget_saved_details(changes)
+
+    def _forget_saved_details(self, changes: List[VocabularyChange]):
+        """Drop the details of written words from memory; call with the lock held"""
+        # Words added again since these changes are still waiting for a write
+        pending = {
+            word
+            for change in self._pending_changes
+            if change.kind == ChangeKind.ADD
+            for word in change.data["word"]
+        }
+        for change in changes:
+            if change.kind == ChangeKind.ADD:
+                for word in change.data["word"]:
+                    if word not in pending:
+                        self._unsaved_details.pop(word, None)
+
+    def _snapshot_vocabulary(self) -> pd.DataFrame:
+        """Copy the vocabulary for the persistence worker; call with the lock held"""
+        # Only the stat columns are modified in place, so they are the only ones
+        # the UI thread could change while the worker is still writing
+        snapshot = self.vocabulary.copy(deep=False)
+        for col in STAT_COLUMNS:
+            snapshot[col] = self.vocabulary[col].copy()
+        return snapshot
+
+    def _record_word_stats(self, idx):
+        """Queue the current stats of a single word for persistence"""
+        row = self.vocabulary.loc[idx]
+        last_practiced, due = row["last_practiced"], row["due"]
+        self._queue_change(
+            VocabularyChange(
+                ChangeKind.UPDATE,
+                {
+                    "word": row["word"],
+                    "times_practiced": int(row["times_practiced"]),
+                    "correct_answers": int(row["correct_answers"]),
+                    "viewed": bool(row["viewed"]),
+                    "last_practiced": last_practiced.isoformat()
+                    if pd.notna(last_practiced)
+                    else None,
+                    "interval": float(row["interval"]),
+                    "ease": float(row["ease"]),
+                    "due": due.isoformat() if pd.notna(due) else None,
+                },
+            )
+        )
 
     def generate_words(
         self,
@@ -173,19 +643,55 @@ class VocabularyController:
         custom_word: str = None,
     ) -> List[Dict]:
         """Generate new words using OpenAI API"""
-        if not self.api_key:
-            raise ValueError("OpenAI API key not found in environment variables")
-
         # If custom_word is provided, generate details for just that word
         if custom_word:
             return [
                 self.generate_word_details(custom_word, native_lang, target_lang, level)
             ]
 
+        request = self._word_generation_request(
+            native_lang, target_lang, level, topics, include_phrases, exclude_words
+        )
+        # Bypass the cache: a repeated prompt should still bring new words
+        response: LlmChatCompletionResponse = (
+            self.llm_provider.provider.get_chat_completion(**request)
+        )
+        return self._new_generated_words(response)
+
+    async def generate_words_async(
+        self,
+        native_lang: str,
+        target_lang: str,
+        level: str,
+        topics: List[str],
+        include_phrases: bool,
+        exclude_words: List[str] = None,
+    ) -> List[Dict]:
+        """Generate new words without blocking, on the app's asyncio loop"""
+        request = self._word_generation_request(
+            native_lang, target_lang, level, topics, include_phrases, exclude_words
+        )
+        response: LlmChatCompletionResponse = (
+            await self.async_llm_provider.provider.get_chat_completion(**request)
+        )
+        return self._new_generated_words(response)
+
+    def _word_generation_request(
+        self,
+        native_lang: str,
+        target_lang: str,
+        level: str,
+        topics: List[str],
+        include_phrases: bool,
+        exclude_words: Optional[List[str]],
+    ) -> Dict:
+        """Build the LLM request that generates new words"""
+        if not self.api_key:
+            raise ValueError("OpenAI API key not found in environment variables")
+
         # Get existing words to exclude
-        existing_words = self.vocabulary["word"].tolist()
-        if exclude_words:
-            existing_words.extend(exclude_words)
+        existing_words = list(exclude_words or [])
+        existing_words += self._exclusion_words(topics, level)
 
         system_prompt = {
             "role": "system",
@@ -210,7 +716,7 @@ class VocabularyController:
 
         user_prompt = {
             "role": "user",
-            "content": f"""Generate 15 words/phrases for language learning:
+            "content": f"""Generate {WORDS_PER_GENERATION + GENERATION_OVERSHOOT} words/phrases for language learning:
             - From {native_lang} to {target_lang}
             - Level: {level}
             - Topics: {", ".join(topics)}
@@ -223,21 +729,75 @@ class VocabularyController:
                 f"\nExclude these words: {', '.join(existing_words)}"
             )
 
-        response: LlmChatCompletionResponse = self.llm_provider.get_chat_completion(
-            messages=[system_prompt, user_prompt],
-            response_format=Words,
-            temperature=0.7,
-            max_tokens=5000,
-        )
+        return {
+            "messages": [system_prompt, user_prompt],
+            "response_format": Words,
+            "temperature": 0.7,
+            "max_tokens": 6500,
+            "deadline_seconds": 120,
+        }
 
+    def _new_generated_words(self, response: LlmChatCompletionResponse) -> List[Dict]:
+        """Get the generated words that are not known yet"""
         # Process the response and ensure all fields are present
         words = Words.model_validate(response.dict_response)
-        return words.dict()["words"]
+
+        # Drop words the model repeated or that are already known in another spelling
+        new_words = []
+        keys = set()
+        for word in words.dict()["words"]:
+            key = self.normalize_word(word["word"])
+            if key in keys or self.find_duplicate(word["word"]) is not None:
+                continue
+            keys.add(key)
+            new_words.append(word)
+        return new_words[:WORDS_PER_GENERATION]
+
+    def _exclusion_words(self, topics: List[str], level: str) -> List[str]:
+        """Get the existing words a generation prompt asks the model not to repeat"""
+        # The model mostly repeats words of the requested topics and level, so
+        # only those are listed; duplicates of the others are dropped afterwards
+        topic_keys = {topic.casefold() for topic in topics}
+        with self._lock:
+            topic = self.vocabulary["topic"]
+            requested_topics = [
+                category
+                for category in topic.cat.categories
+                if str(category).casefold() in topic_keys
+            ]
+            relevance = 2 * topic.isin(requested_topics).to_numpy(np.int8) + (
+                self.vocabulary["level"] == level
+            ).to_numpy(np.int8)
+            candidates = np.flatnonzero(relevance)
+            # Words matching both first, then topic, then level; newest first within each
+            order = np.lexsort((-candidates, -relevance[candidates]))
+            chosen = candidates[order[:MAX_EXCLUDED_WORDS]]
+            return self.vocabulary["word"].to_numpy()[chosen].tolist()
 
     def generate_word_details(
         self, word: str, native_lang: str, target_lang: str, level: str
     ) -> Dict:
         """Generate details for a single word using OpenAI API"""
+        request = self._word_details_request(word, native_lang, target_lang, level)
+        response: LlmChatCompletionResponse = self.llm_provider.get_chat_completion(
+            **request
+        )
+        return WordResponse.model_validate(response.dict_response).dict()
+
+    async def generate_word_details_async(
+        self, word: str, native_lang: str, target_lang: str, level: str
+    ) -> Dict:
+        """Generate details for a single word without blocking, on the app's asyncio loop"""
+        request = self._word_details_request(word, native_lang, target_lang, level)
+        response: LlmChatCompletionResponse = (
+            await self.async_llm_provider.get_chat_completion(**request)
+        )
+        return WordResponse.model_validate(response.dict_response).dict()
+
+    def _word_details_request(
+        self, word: str, native_lang: str, target_lang: str, level: str
+    ) -> Dict:
+        """Build the LLM request that generates the details of a word"""
         if not self.api_key:
             raise ValueError("OpenAI API key not found in environment variables")
 
@@ -269,49 +829,127 @@ class VocabularyController:
             """,
         }
 
-        response: LlmChatCompletionResponse = self.llm_provider.get_chat_completion(
-            messages=[system_prompt, user_prompt],
-            response_format=WordResponse,
-            temperature=0.7,
-            max_tokens=1000,
-        )
+        return {
+            "messages": [system_prompt, user_prompt],
+            "response_format": WordResponse,
+            "temperature": 0.7,
+            "max_tokens": 1000,
+            "deadline_seconds": 60,
+        }
 
-        # Process the response and ensure all fields are present
-        word_details = WordResponse.model_validate(response.dict_response)
-        return word_details.dict()
+    def add_words(self, words: List[Dict]) -> Dict[str, List[str]]:
+        """Add new words to vocabulary in a single batch
 
-    def add_words(self, words: List[Dict]):
-        """Add new words to vocabulary"""
+        Returns:
+            Dict: The added words that nearly duplicate a word in the vocabulary
+            or earlier in the batch, mapped to the words they resemble; batches
+            of more than MAX_NEAR_DUPLICATE_BATCH words are not checked
+        """
+        # Skip words that already exist or repeat within the batch, in any spelling
+        batch = []
+        batch_keys = set()
         for word in words:
-            # Skip if word already exists
-            if word["word"] in self.vocabulary["word"].values:
+            key = self.normalize_word(word["word"])
+            if key in batch_keys or self.find_duplicate(word["word"]) is not None:
                 continue
+            batch_keys.add(key)
+            batch.append(word)
 
+        # Validate the whole batch before touching the vocabulary
+        for word in batch:
             # Ensure options is a list of exactly 4 items
             options = word["options"]
             if not isinstance(options, list) or len(options) != 4:
                 raise ValueError(f"Word {word['word']} must have exactly 4 options")
 
-            new_row = {
-                "word": word["word"],
-                "translation": word["translation"],
-                "example": word["example"],
-                "example_translation": word["example_translation"],
+        if not batch:
+            return {}
+
+        new_rows = pd.DataFrame(
+            {
+                "word": [word["word"] for word in batch],
+                "translation": [word["translation"] for word in batch],
+                "example": [word["example"] for word in batch],
+                "example_translation": [word["example_translation"] for word in batch],
                 "times_practiced": 0,
                 "correct_answers": 0,
-                "topic": word.get("topic", ""),
-                "level": word.get("level", ""),
-                "sentence_to_fill": word["sentence_to_fill"],
-                "sentence_to_fill_translation": word["sentence_to_fill_translation"],
-                "options": options,
-                "correct_answer": word["correct_answer"],
+                "topic": [word.get("topic", "") for word in batch],
+                "level": [word.get("level", "") for word in batch],
+                "sentence_to_fill": [word["sentence_to_fill"] for word in batch],
+                "sentence_to_fill_translation": [
+                    word["sentence_to_fill_translation"] for word in batch
+                ],
+                "options": [word["options"] for word in batch],
+                "correct_answer": [word["correct_answer"] for word in batch],
                 "viewed": False,
                 "last_practiced": None,
-            }
-            self.vocabulary = pd.concat(
-                [self.vocabulary, pd.DataFrame([new_row])], ignore_index=True
+                "interval": 0.0,
+                "ease": DEFAULT_EASE,
+                "due": None,
+            },
+            columns=VOCABULARY_COLUMNS,
+        )
+        new_rows = apply_vocabulary_dtypes(new_rows)
+        rows = new_rows
+        if self.storage.lazy_details:
+            self._unsaved_details.update(
+                new_rows.set_index("word")[DETAIL_COLUMNS].to_dict("index")
             )
-        self.save_vocabulary()
+            rows = new_rows.drop(columns=DETAIL_COLUMNS)
+        # New words are not started and have no success rate yet
+        rows = rows.assign(
+            success_rate=0.0,
+            learning_status=np.full(
+                len(rows), LearningStatus.NOT_STARTED, dtype=np.int8
+            ),
+        )
+
+        check_near_duplicates = len(new_rows) <= MAX_NEAR_DUPLICATE_BATCH
+        with self._lock:
+            # Until the planner's worker has built the edit index, words are
+            # added unchecked; it is then built with the new words included
+            edit_index = self._edit_index
+            if self.vocabulary.empty:
+                self.vocabulary = rows
+            else:
+                # Concatenating categoricals keeps the dtype only if the categories match
+                self._align_categories(rows)
+                self.vocabulary = pd.concat([self.vocabulary, rows], ignore_index=True)
+            self._word_index.update(
+                zip(new_rows["word"], self.vocabulary.index[-len(new_rows) :])
+            )
+            self._status_counts[LearningStatus.NOT_STARTED] += len(new_rows)
+            self._words_version += 1
+            normalized_words = self._get_normalized_words()
+            for word in new_rows["word"]:
+                normalized_words.setdefault(self.normalize_word(word), word)
+            if self._distractor_index is not None:
+                for word, topic, level in zip(
+                    new_rows["word"], new_rows["topic"], new_rows["level"]
+                ):
+                    self._distractor_index.add(
+                        word, _category_value(topic), _category_value(level)
+                    )
+            # Flag near-duplicates while adding, so words in the batch are compared too
+            near_duplicates = {}
+            if edit_index is not None:
+                for word in new_rows["word"]:
+                    if check_near_duplicates:
+                        similar = self.get_near_duplicates(word)
+                        if similar:
+                            near_duplicates[word] = similar
+                    edit_index.add(word)
+            self._queue_change(VocabularyChange(ChangeKind.ADD, new_rows))
+        return near_duplicates
+
+    def _align_categories(self, rows: pd.DataFrame):
+        """Give the vocabulary and new rows the same categories in each categorical column"""
+        for col in CATEGORY_COLUMNS:
+            categories = self.vocabulary[col].cat.categories.union(
+                rows[col].cat.categories
+            )
+            self.vocabulary[col] = self.vocabulary[col].cat.set_categories(categories)
+            rows[col] = rows[col].cat.set_categories(categories)
 
     def get_unpracticed_words(self) -> pd.DataFrame:
         """Get words that haven't been practiced yet"""
@@ -319,127 +957,216 @@ class VocabularyController:
 
     def get_daily_words(self, count: int) -> pd.DataFrame:
         """Get words for daily practice, prioritizing unpracticed words and including some old words"""
+        times_practiced = self.vocabulary["times_practiced"].to_numpy()
+
         # First get unpracticed words (up to count-2 to leave room for review words)
-        unpracticed = self.get_unpracticed_words()
-        unpracticed_count = min(len(unpracticed), count - 2)
-        selected_unpracticed = (
-            unpracticed.sample(n=unpracticed_count)
-            if unpracticed_count > 0
-            else pd.DataFrame()
+        unpracticed = np.flatnonzero(times_practiced == 0)
+        selected_unpracticed = np.random.choice(
+            unpracticed, max(0, min(len(unpracticed), count - 2)), replace=False
         )
 
         # Get words that were learned a long time ago (practiced >= 7 times)
-        old_words = self.vocabulary[
-            (
-                self.vocabulary["times_practiced"]
-                >= self.user_controller.min_practice_count
-            )
-            & (
-                self.vocabulary["correct_answers"] / self.vocabulary["times_practiced"]
-                >= self.user_controller.min_success_rate / 100
-            )
-        ]
+        old_words = np.flatnonzero(
+            self.vocabulary["learning_status"].to_numpy() == LearningStatus.LEARNT
+        )
 
         # If we have old words, select 1-2 randomly
-        old_word_count = min(len(old_words), 2)
-        selected_old = (
-            old_words.sample(n=old_word_count) if old_word_count > 0 else pd.DataFrame()
+        selected_old = np.random.choice(
+            old_words, min(len(old_words), 2), replace=False
         )
 
         # Calculate how many more words we need
         needed = count - len(selected_unpracticed) - len(selected_old)
 
         # Get the least practiced words for the remaining slots
-        practiced = self.vocabulary[
-            ~self.vocabulary.index.isin(selected_unpracticed.index)
-            & ~self.vocabulary.index.isin(selected_old.index)
-            & (self.vocabulary["times_practiced"] > 0)
-        ]
-        least_practiced = (
-            practiced.nsmallest(needed, "times_practiced")
-            if needed > 0
-            else pd.DataFrame()
-        )
+        practiced = times_practiced > 0
+        practiced[selected_old] = False
+        practiced = np.flatnonzero(practiced)
+        least_practiced = practiced[_smallest(times_practiced[practiced], needed)]
 
         # Combine all selected words and shuffle
-        result = pd.concat([selected_unpracticed, selected_old, least_practiced])
-        return result.sample(frac=1)  # Shuffle the final selection
+        rows = np.concatenate([selected_unpracticed, selected_old, least_practiced])
+        return self._with_details(self.vocabulary.iloc[np.random.permutation(rows)])
 
     def needs_new_words(self, min_unpracticed: int = 5) -> bool:
         """Check if we need to generate new words based on unpracticed count"""
         unpracticed_count = len(self.get_unpracticed_words())
         return unpracticed_count < min_unpracticed
 
+    def _get_due_queue(self) -> DueQueue:
+        """Get the review queue, building it from the vocabulary on first use"""
+        if self._due_queue is None:
+            self._due_queue = DueQueue()
+            self._due_queue.rebuild(self.vocabulary["word"], self.vocabulary["due"])
+        return self._due_queue
+
+    def _get_distractor_index(self) -> DistractorIndex:
+        """Get the distractor index, building it from the vocabulary on first use"""
+        if self._distractor_index is None:
+            self._distractor_index = DistractorIndex()
+            self._distractor_index.rebuild(
+                self.vocabulary["word"],
+                self._category_values(self.vocabulary, "topic"),
+                self._category_values(self.vocabulary, "level"),
+            )
+        return self._distractor_index
+
+    def _category_values(self, vocabulary: pd.DataFrame, col: str) -> List:
+        """Get a topic or level column as hashable keys, with None for missing values"""
+        values = vocabulary[col]
+        return values.astype(object).where(values.notna(), None).tolist()
+
+    def get_distractors(self, word: str, count: int = 3) -> List[str]:
+        """Get up to count other words to offer as wrong options, from the word's topic and level when possible"""
+        with self._lock:
+            idx = self.find_word(word)
+            if idx is None:
+                topic = level = None
+            else:
+                topic = _category_value(self.vocabulary.at[idx, "topic"])
+                level = _category_value(self.vocabulary.at[idx, "level"])
+            # Building the edit index takes seconds, so until the planner's
+            # worker has built it the options come from the buckets alone
+            confusable = (
+                self._edit_index.nearest(
+                    word, min(count, CONFUSABLE_DISTRACTORS), CONFUSABLE_DISTANCE
+                )
+                if self._edit_index is not None
+                else []
+            )
+            return confusable + self._get_distractor_index().sample(
+                word, topic, level, count - len(confusable), exclude=confusable
+            )
+
+    def get_near_duplicates(self, word: str) -> List[str]:
+        """Get the words in the vocabulary spelled almost like word, closest first"""
+        distance = near_duplicate_distance(word)
+        if not distance:
+            return []
+        with self._lock:
+            # Nothing is flagged until the planner's worker has built the index
+            if self._edit_index is None:
+                return []
+            return self._edit_index.nearest(word, 5, distance)
+
+    def _schedule_review(self, idx, due: datetime):
+        """Set when a word is due for review next"""
+        self.vocabulary.at[idx, "due"] = due
+        if self._due_queue is not None:
+            self._due_queue.push(self.vocabulary.at[idx, "word"], due)
+
+    def _uses_spaced_repetition(self) -> bool:
+        """Check if tests and translation practice pick the words due for review"""
+        return (
+            self.user_controller.selection_strategy
+            == SelectionStrategies.SPACED_REPETITION.value
+        )
+
+    def get_due_words(self, count: int) -> pd.DataFrame:
+        """Get the words whose spaced repetition review is due first, most overdue first"""
+        return self.vocabulary.loc[self._queued_due_labels(count)]
+
+    def _queued_due_labels(self, count: int) -> List:
+        """Get the labels of the count words due first, from the review queue"""
+        words = self._get_due_queue().first(count)
+        return [self._word_index[word] for word in words]
+
     def get_test_words(self, count: int) -> pd.DataFrame:
         """Get words for testing, prioritizing rarely practiced words and words practiced long ago"""
-        # Get words that have been viewed
-        viewed_words = self.vocabulary[self.vocabulary["viewed"] == True].copy()
-
-        if viewed_words.empty:
+        labels = self._test_labels(self.vocabulary, count, self._queued_due_labels)
+        if len(labels) == 0 and not self._uses_spaced_repetition():
             return pd.DataFrame()  # Return empty DataFrame if no words have been viewed
+        return self._with_details(self.vocabulary.loc[labels])
 
-        # Calculate success rate for words that have been practiced
-        viewed_words["success_rate"] = 0.0  # Default for unpracticed words
-        mask = viewed_words["times_practiced"] > 0
-        if mask.any():
-            viewed_words.loc[mask, "success_rate"] = (
-                viewed_words.loc[mask, "correct_answers"]
-                / viewed_words.loc[mask, "times_practiced"]
-            )
+    def _test_labels(
+        self, vocabulary: pd.DataFrame, count: int, due_labels
+    ) -> pd.Index:
+        """Get the labels of the words to test, in random order"""
+        if self._uses_spaced_repetition():
+            return np.random.permutation(due_labels(count))
+
+        # Get words that have been viewed
+        viewed = np.flatnonzero(vocabulary["viewed"].to_numpy())
+
+        if len(viewed) == 0:
+            return vocabulary.index[:0]
 
         # Split the selection into two parts:
         # 1. Words rarely practiced or with lower success rates
         # 2. Words practiced long ago
+        rare_keys = self._low_practice_keys(vocabulary)[viewed]
 
-        # Sort by times_practiced (ascending) and success_rate (ascending)
-        rare_practiced_words = viewed_words.sort_values(
-            by=["times_practiced", "success_rate"], ascending=[True, True]
-        )
-
-        # Sort by last_practiced (ascending - older first)
-        old_practiced_words = viewed_words.sort_values(
-            by=["last_practiced"], ascending=[True]
-        )
+        # Order by last_practiced (older first)
+        old_keys = _timestamp_keys(vocabulary["last_practiced"].iloc[viewed])
 
         # Select half from rarely practiced and half from long ago practiced
         half_count = count // 2
         remainder = count % 2  # In case count is odd
 
-        rare_selected = rare_practiced_words.head(half_count + remainder)
-        old_selected = old_practiced_words[
-            ~old_practiced_words.index.isin(rare_selected.index)
-        ].head(half_count)
+        rare_selected = _smallest(rare_keys, half_count + remainder)
+        remaining = np.ones(len(viewed), dtype=bool)
+        remaining[rare_selected] = False
+        remaining = np.flatnonzero(remaining)
+        old_selected = remaining[_smallest(old_keys[remaining], half_count)]
 
         # Combine and shuffle
-        result = pd.concat([rare_selected, old_selected])
-        return result.sample(min(len(result), count))
+        rows = viewed[np.concatenate([rare_selected, old_selected])]
+        return vocabulary.index[np.random.permutation(rows)]
 
     def get_flashcard_words(self, count: int) -> pd.DataFrame:
         """Get words for flashcards, only returning unviewed words"""
-        # Only get unviewed words
-        unviewed_words = self.vocabulary[self.vocabulary["viewed"] == False].copy()
-
-        if unviewed_words.empty:
+        labels = self._flashcard_labels(self.vocabulary, count)
+        if len(labels) == 0:
             return pd.DataFrame()  # Return empty DataFrame if no unviewed words
+        return self._with_details(self.vocabulary.loc[labels])
 
-        # Return a random sample of unviewed words
-        return unviewed_words.sample(min(len(unviewed_words), count))
+    def _flashcard_labels(self, vocabulary: pd.DataFrame, count: int) -> pd.Index:
+        """Get the labels of a random sample of unviewed words"""
+        unviewed = vocabulary.index[~vocabulary["viewed"].to_numpy()]
+        return pd.Index(
+            np.random.choice(unviewed, min(len(unviewed), count), replace=False)
+        )
 
     def mark_word_as_viewed(self, word: str):
         """Mark a word as viewed"""
-        idx = self.vocabulary.index[self.vocabulary["word"] == word].tolist()[0]
-        self.vocabulary.at[idx, "viewed"] = True
-        self.vocabulary.at[idx, "last_practiced"] = datetime.now()
-        self.save_vocabulary()
+        with self._lock:
+            idx = self._word_index[word]
+            now = datetime.now()
+            self.vocabulary.at[idx, "viewed"] = True
+            self.vocabulary.at[idx, "last_practiced"] = now
+            # A newly seen word is due for its first review right away
+            if pd.isna(self.vocabulary.at[idx, "due"]):
+                self._schedule_review(idx, now)
+            self._record_word_stats(idx)
 
     def update_word_stats(self, word: str, correct: bool):
         """Update statistics for a word after practice"""
-        idx = self.vocabulary.index[self.vocabulary["word"] == word].tolist()[0]
-        self.vocabulary.at[idx, "times_practiced"] += 1
-        if correct:
-            self.vocabulary.at[idx, "correct_answers"] += 1
-        self.vocabulary.at[idx, "last_practiced"] = datetime.now()
-        self.save_vocabulary()
+        with self._lock:
+            idx = self._word_index[word]
+            now = datetime.now()
+            self.vocabulary.at[idx, "times_practiced"] += 1
+            if correct:
+                self.vocabulary.at[idx, "correct_answers"] += 1
+            self.vocabulary.at[idx, "last_practiced"] = now
+            self._update_progress(idx)
+
+            # Reschedule the word's next review with SM-2
+            interval, ease = sm2_review(
+                float(self.vocabulary.at[idx, "interval"]),
+                float(self.vocabulary.at[idx, "ease"]),
+                correct,
+            )
+            self.vocabulary.at[idx, "interval"] = interval
+            self.vocabulary.at[idx, "ease"] = ease
+            self._schedule_review(idx, now + timedelta(days=interval))
+            self._record_word_stats(idx)
+
+    def update_last_practiced(self, word: str):
+        """Update a word's last_practiced timestamp without affecting statistics"""
+        with self._lock:
+            idx = self._word_index[word]
+            self.vocabulary.at[idx, "last_practiced"] = datetime.now()
+            self._record_word_stats(idx)
 
     def get_progress(self) -> pd.DataFrame:
         """
@@ -456,86 +1183,107 @@ class VocabularyController:
             2 = In progress (practiced with good progress)
             3 = Learnt (meets minimum practice and success criteria)
         """
-        # Get all words
-        all_words = self.vocabulary.copy()
-
-        if len(all_words) == 0:
-            return pd.DataFrame(
-                columns=[
-                    "word",
-                    "translation",
-                    "success_rate",
-                    "times_practiced",
-                    "learning_status",
-                ]
-            )
-
-        # Calculate success rate for words that have been practiced
-        all_words["success_rate"] = 0.0  # Default for unpracticed words
-        mask = all_words["times_practiced"] > 0
-        if mask.any():
-            all_words.loc[mask, "success_rate"] = (
-                all_words.loc[mask, "correct_answers"]
-                / all_words.loc[mask, "times_practiced"]
-            )
+        columns = [
+            "word",
+            "translation",
+            "success_rate",
+            "times_practiced",
+            "learning_status",
+        ]
+        if len(self.vocabulary) == 0:
+            return pd.DataFrame(columns=columns)
 
-        # Get learning thresholds from settings
-        min_practice = self.user_controller.min_practice_count
-        min_success = self.user_controller.min_success_rate / 100  # Convert to decimal
+        # Success rates and learning statuses are kept up to date by every change
+        progress = self.vocabulary[columns].assign(
+            success_rate=lambda words: words["success_rate"] * 100
+        )
 
-        # Determine learning status for sorting
-        all_words["learning_status"] = 0  # Default: Not started
+        # Sort by learning status (ascending) and success rate (descending)
+        return progress.sort_values(
+            by=["learning_status", "success_rate"], ascending=[True, False]
+        )
 
-        # Words that have been practiced but with low success rate
-        mask_needs_practice = (all_words["times_practiced"] > 0) & (
-            all_words["success_rate"] < 0.6
+    def get_progress_summary(self) -> Dict:
+        """Get the word counts and average success rate (%) shown in the menu and progress screens"""
+        practiced = (
+            len(self.vocabulary) - self._status_counts[LearningStatus.NOT_STARTED]
         )
-        all_words.loc[mask_needs_practice, "learning_status"] = 1  # Needs practice
+        return {
+            "total_words": len(self.vocabulary),
+            "words_learnt": self._status_counts[LearningStatus.LEARNT],
+            # Practiced but not yet learnt
+            "words_in_progress": practiced - self._status_counts[LearningStatus.LEARNT],
+            "average_success_rate": self._success_rate_sum / practiced * 100
+            if practiced
+            else 0.0,
+        }
 
-        # Words with good progress
-        mask_in_progress = (
-            (all_words["times_practiced"] > 0)
-            & (all_words["success_rate"] >= 0.6)
-            & (
-                (all_words["times_practiced"] < min_practice)
-                | (all_words["success_rate"] < min_success)
-            )
+    def check_sentence_translation(
+        self,
+        original_sentence: str,
+        translation: str,
+        native_lang: str,
+        target_lang: str,
+    ) -> Dict:
+        """Check a sentence translation using OpenAI API"""
+        request = self._translation_check_request(
+            original_sentence, translation, native_lang, target_lang
         )
-        all_words.loc[mask_in_progress, "learning_status"] = 2  # In progress
+        response: LlmChatCompletionResponse = self.llm_provider.get_chat_completion(
+            **request
+        )
+        return TranslationCheckResponse.model_validate(response.dict_response).dict()
 
-        # Words that are fully learnt
-        mask_learnt = (all_words["times_practiced"] >= min_practice) & (
-            all_words["success_rate"] >= min_success
+    async def check_sentence_translation_async(
+        self,
+        original_sentence: str,
+        translation: str,
+        native_lang: str,
+        target_lang: str,
+    ) -> Dict:
+        """Check a sentence translation without blocking, on the app's asyncio loop"""
+        request = self._translation_check_request(
+            original_sentence, translation, native_lang, target_lang
         )
-        all_words.loc[mask_learnt, "learning_status"] = 3  # Learnt
+        response: LlmChatCompletionResponse = (
+            await self.async_llm_provider.get_chat_completion(**request)
+        )
+        return TranslationCheckResponse.model_validate(response.dict_response).dict()
 
-        # Convert success rate to percentage
-        all_words["success_rate"] = all_words["success_rate"] * 100
+    async def stream_sentence_translation_check(
+        self,
+        original_sentence: str,
+        translation: str,
+        native_lang: str,
+        target_lang: str,
+    ) -> AsyncIterator[Dict]:
+        """Check a sentence translation, yielding the verdict and comment as they stream in.
 
-        # Sort by learning status (ascending) and success rate (descending)
-        sorted_words = all_words.sort_values(
-            by=["learning_status", "success_rate"], ascending=[True, False]
+        Updates have is_correct set to None until the verdict is parsed, and
+        the comment written so far; the last update is the full check.
+        """
+        request = self._translation_check_request(
+            original_sentence, translation, native_lang, target_lang
         )
+        async for response in self.async_llm_provider.stream_chat_completion(**request):
+            if response.usage is None:
+                yield {
+                    "is_correct": response.dict_response.get("is_correct"),
+                    "comment": response.dict_response.get("comment", ""),
+                }
+            else:
+                yield TranslationCheckResponse.model_validate(
+                    response.dict_response
+                ).dict()
 
-        # Return the relevant columns
-        return sorted_words[
-            [
-                "word",
-                "translation",
-                "success_rate",
-                "times_practiced",
-                "learning_status",
-            ]
-        ]
-
-    def check_sentence_translation(
+    def _translation_check_request(
         self,
         original_sentence: str,
         translation: str,
         native_lang: str,
         target_lang: str,
     ) -> Dict:
-        """Check a sentence translation using OpenAI API"""
+        """Build the LLM request that checks a sentence translation"""
         if not self.api_key:
             raise ValueError("OpenAI API key not found in environment variables")
 
@@ -568,59 +1316,151 @@ class VocabularyController:
             """,
         }
 
+        return {
+            "messages": [system_prompt, user_prompt],
+            "response_format": TranslationCheckResponse,
+            "temperature": 0.3,
+            "max_tokens": 500,
+            "deadline_seconds": 30,
+        }
+
+    def check_sentence_translations(
+        self,
+        translations: List[Tuple[str, str]],
+        native_lang: str,
+        target_lang: str,
+    ) -> List[Dict]:
+        """Check many (original sentence, translation) pairs in a single request"""
+        request = self._translation_batch_request(
+            translations, native_lang, target_lang
+        )
         response: LlmChatCompletionResponse = self.llm_provider.get_chat_completion(
-            messages=[system_prompt, user_prompt],
-            response_format=TranslationCheckResponse,
-            temperature=0.3,
-            max_tokens=500,
+            **request
+        )
+        return self._translation_batch_results(response, len(translations))
+
+    async def check_sentence_translations_async(
+        self,
+        translations: List[Tuple[str, str]],
+        native_lang: str,
+        target_lang: str,
+    ) -> List[Dict]:
+        """Check many sentence translations in one request without blocking"""
+        request = self._translation_batch_request(
+            translations, native_lang, target_lang
+        )
+        response: LlmChatCompletionResponse = (
+            await self.async_llm_provider.get_chat_completion(**request)
+        )
+        return self._translation_batch_results(response, len(translations))
+
+    def _translation_batch_request(
+        self,
+        translations: List[Tuple[str, str]],
+        native_lang: str,
+        target_lang: str,
+    ) -> Dict:
+        """Build the LLM request that checks numbered sentence translations"""
+        if not self.api_key:
+            raise ValueError("OpenAI API key not found in environment variables")
+
+        system_prompt = {
+            "role": "system",
+            "content": """You are a language learning assistant. Evaluate the user's translations of numbered sentences.
+            
+            For each numbered pair of an original sentence and the user's translation, provide:
+            - number: the number of the pair
+            - is_correct: boolean indicating if the translation is correct (true or false)
+            - comment: helpful feedback on the translation
+            
+            For translations that are not correct, provide specific feedback about what's wrong
+            and how to improve it. Mention relevant grammar rules or vocabulary issues.
+            
+            Even for correct translations, provide a short encouraging comment or a note about
+            a nuance of the translation.
+            
+            Evaluate every pair exactly once and judge each one on its own.
+            """,
+        }
+
+        pairs = "\n".join(
+            f"{number}. Original ({native_lang}): {original}\n"
+            f"   Translation ({target_lang}): {translation}"
+            for number, (original, translation) in enumerate(translations, 1)
         )
+        user_prompt = {
+            "role": "user",
+            "content": f"Evaluate these translations:\n\n{pairs}",
+        }
 
-        # Process the response
-        check_result = TranslationCheckResponse.model_validate(response.dict_response)
-        return check_result.dict()
+        return {
+            "messages": [system_prompt, user_prompt],
+            "response_format": TranslationChecks,
+            "temperature": 0.3,
+            "max_tokens": TRANSLATION_CHECK_TOKENS * len(translations),
+            "deadline_seconds": 30 + 10 * len(translations),
+        }
+
+    def _translation_batch_results(
+        self, response: LlmChatCompletionResponse, count: int
+    ) -> List[Dict]:
+        """Get the checks of a batched request in the order the translations were given"""
+        checks = TranslationChecks.model_validate(response.dict_response).checks
+        by_number = {check.number: check for check in checks}
+        missing = [number for number in range(1, count + 1) if number not in by_number]
+        if missing:
+            raise ValueError(f"No check returned for translations {missing}")
+        return [
+            TranslationCheckResponse(
+                is_correct=by_number[number].is_correct,
+                comment=by_number[number].comment,
+            ).dict()
+            for number in range(1, count + 1)
+        ]
 
     def get_translation_practice_sentences(self, count: int) -> pd.DataFrame:
         """Get sentences for translation practice from vocabulary pool, balanced between practice frequency and time since last practice"""
         if len(self.vocabulary) == 0:
             return pd.DataFrame()
+        labels = self._translation_labels(
+            self.vocabulary, count, self._queued_due_labels
+        )
+        return self._with_details(self.vocabulary.loc[labels])
+
+    def _translation_labels(
+        self, vocabulary: pd.DataFrame, count: int, due_labels
+    ) -> pd.Index:
+        """Get the labels of the words to translate, in random order"""
+        if len(vocabulary) == 0:
+            return vocabulary.index[:0]
 
-        # Create a copy of the vocabulary to work with
-        all_words = self.vocabulary.copy()
+        if self._uses_spaced_repetition():
+            due = due_labels(count)
+            # Before any word is seen, fall back to the balanced selection
+            if len(due) > 0:
+                return np.random.permutation(due)
 
         # Split the selection into two parts:
-        # 1. Words that haven't been practiced much (fewer attempts)
+        # 1. Words that haven't been practiced much (fewer attempts, lower success rates)
         # 2. Words that were practiced long ago
-
-        # Calculate success rate for words that have been practiced
-        all_words["success_rate"] = all_words.apply(
-            lambda row: row["correct_answers"] / row["times_practiced"]
-            if row["times_practiced"] > 0
-            else 0,
-            axis=1,
-        )
-
-        # Sort by times_practiced (ascending)
-        low_practice_words = all_words.sort_values(
-            by=["times_practiced"], ascending=[True]
-        )
-
-        # Sort by last_practiced (ascending - older first)
-        old_practice_words = all_words.sort_values(
-            by=["last_practiced"], ascending=[True]
-        )
+        low_practice_keys = self._low_practice_keys(vocabulary)
+        old_practice_keys = _timestamp_keys(vocabulary["last_practiced"])
 
         # Select half from each category
         half_count = count // 2
         remainder = count % 2  # In case count is odd
 
-        low_practice_selected = low_practice_words.head(half_count + remainder)
-        old_practice_selected = old_practice_words[
-            ~old_practice_words.index.isin(low_practice_selected.index)
-        ].head(half_count)
+        low_practice_selected = _smallest(low_practice_keys, half_count + remainder)
+        remaining = np.ones(len(vocabulary), dtype=bool)
+        remaining[low_practice_selected] = False
+        remaining = np.flatnonzero(remaining)
+        old_practice_selected = remaining[
+            _smallest(old_practice_keys[remaining], half_count)
+        ]
 
         # Combine and shuffle
-        result = pd.concat([low_practice_selected, old_practice_selected])
-        return result.sample(min(len(result), count))
+        rows = np.concatenate([low_practice_selected, old_practice_selected])
+        return vocabulary.index[np.random.permutation(rows)]
 
     def delete_word(self, word: str) -> bool:
         """Delete a word from the vocabulary
@@ -633,21 +1473,39 @@ class VocabularyController:
         """
         try:
             # Find the word and remove it
-            word_indices = self.vocabulary.index[
-                self.vocabulary["word"] == word
-            ].tolist()
-            if not word_indices:
+            idx = self.find_word(word)
+            if idx is None:
                 print(f"Word '{word}' not found in vocabulary")
                 return False
 
-            # Drop all matching indices (should usually be just one)
-            self.vocabulary = self.vocabulary.drop(word_indices)
-
-            # Reset index after dropping rows
-            self.vocabulary = self.vocabulary.reset_index(drop=True)
-
-            # Save the updated vocabulary
-            self.save_vocabulary()
+            with self._lock:
+                self._status_counts[self.vocabulary.at[idx, "learning_status"]] -= 1
+                self._success_rate_sum -= float(self.vocabulary.at[idx, "success_rate"])
+                if self._distractor_index is not None:
+                    self._distractor_index.remove(
+                        word,
+                        _category_value(self.vocabulary.at[idx, "topic"]),
+                        _category_value(self.vocabulary.at[idx, "level"]),
+                    )
+                self.vocabulary = self.vocabulary.drop(idx)
+                self._words_version += 1
+                self._details.pop(word, None)
+                self._unsaved_details.pop(word, None)
+                if self._due_queue is not None:
+                    self._due_queue.remove(word)
+                if self._edit_index is not None:
+                    self._edit_index.remove(word)
+                if self._normalized_words is not None:
+                    key = self.normalize_word(word)
+                    if self._normalized_words.get(key) == word:
+                        del self._normalized_words[key]
+
+                # Reset index after dropping rows; this shifts every later row
+                self.vocabulary = self.vocabulary.reset_index(drop=True)
+                self._rebuild_word_index()
+
+                # Save the updated vocabulary
+                self._queue_change(VocabularyChange(ChangeKind.DELETE, word))
             return True
         except Exception as e:
             print(f"Error deleting word: {e}")
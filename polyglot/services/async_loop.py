@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Callable, Coroutine, Optional, Set
+
+
+class TkAsyncLoop:
+    """Asyncio event loop driven by the Tk mainloop.
+
+    Tk owns the main thread, so instead of blocking in run_forever() the
+    loop is stepped from after() callbacks: each step runs whatever is
+    ready without waiting, and steps are scheduled only while tasks are
+    pending. Coroutines therefore run on the Tk thread, and their results
+    are handed to callbacks that may update widgets directly.
+    """
+
+    def __init__(self, widget, interval_ms: int = 20):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.loop = asyncio.new_event_loop()
+        self._tasks: Set[asyncio.Task] = set()
+        self._stepping = False
+
+    def submit(
+        self,
+        coroutine: Coroutine,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> asyncio.Task:
+        """Start a coroutine and call on_done with its result or on_error with its exception"""
+        task = self.loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._finish(done, on_done, on_error))
+        self._schedule_step()
+        return task
+
+    def _finish(self, task: asyncio.Task, on_done, on_error):
+        """Hand a finished task's outcome to its callbacks"""
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(task.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            print(f"Error in background task: {error}")
+
+    def _schedule_step(self):
+        """Step the loop soon, unless a step is already scheduled"""
+        if not self._stepping and self._tasks:
+            self._stepping = True
+            self.widget.after(self.interval_ms, self._step)
+
+    def _step(self):
+        """Run the callbacks that are ready and poll I/O without blocking"""
+        self._stepping = False
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self._schedule_step()
+
+    def close(self):
+        """Cancel pending tasks and close the loop"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            self.loop.run_until_complete(
+                asyncio.gather(*self._tasks, return_exceptions=True)
+            )
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
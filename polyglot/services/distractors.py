@@ -0,0 +1,127 @@
+import random
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+class _Bucket:
+    """Words kept in a list with each word's position, for O(1) updates and draws"""
+
+    def __init__(self):
+        self.words: List[str] = []
+        self.positions: Dict[str, int] = {}
+
+    def add(self, word: str):
+        """Append a word unless it is already in the bucket"""
+        if word not in self.positions:
+            self.positions[word] = len(self.words)
+            self.words.append(word)
+
+    def remove(self, word: str):
+        """Remove a word if it is in the bucket"""
+        position = self.positions.pop(word, None)
+        if position is None:
+            return
+        # Move the last word into the gap instead of shifting the list
+        last = self.words.pop()
+        if position < len(self.words):
+            self.words[position] = last
+            self.positions[last] = position
+
+    def sample(self, count: int, exclude: Set[str]) -> List[str]:
+        """Draw up to count distinct words that are not excluded"""
+        excluded = sum(word in self.positions for word in exclude)
+        available = len(self.words) - excluded
+        if available <= 0 or count <= 0:
+            return []
+        # Filtering is cheap for small buckets and avoids long rejection loops
+        if available <= 2 * (count + excluded):
+            candidates = [word for word in self.words if word not in exclude]
+            return random.sample(candidates, min(count, len(candidates)))
+
+        chosen: List[str] = []
+        seen = set(exclude)
+        while len(chosen) < count:
+            word = self.words[random.randrange(len(self.words))]
+            if word not in seen:
+                seen.add(word)
+                chosen.append(word)
+        return chosen
+
+
+class DistractorIndex:
+    """Words bucketed by topic and level, for drawing wrong answer options.
+
+    Every word sits in its (topic, level) bucket, its level bucket and the
+    bucket of all words. Distractors are drawn from the most specific bucket
+    first and topped up from the broader ones when it runs short, so a
+    question costs O(1) however large the vocabulary is.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple, _Bucket] = {}
+
+    @staticmethod
+    def _keys(topic: Optional[Hashable], level: Optional[Hashable]) -> List[Tuple]:
+        """Keys of the buckets a word belongs to, most specific first"""
+        return [(topic, level), (level,), ()]
+
+    def rebuild(
+        self,
+        words: Iterable[str],
+        topics: Iterable[Optional[Hashable]],
+        levels: Iterable[Optional[Hashable]],
+    ):
+        """Replace the index with the given words and their topics and levels"""
+        groups: Dict[Tuple, List[str]] = {}
+        seen = set()
+        for word, topic, level in zip(words, topics, levels):
+            if word in seen:
+                continue
+            seen.add(word)
+            groups.setdefault((topic, level), []).append(word)
+
+        # Fill the broader buckets group by group rather than word by word
+        buckets: Dict[Tuple, List[str]] = {}
+        for (topic, level), group in groups.items():
+            for key in self._keys(topic, level):
+                buckets.setdefault(key, []).extend(group)
+        self._buckets = {}
+        for key, bucket_words in buckets.items():
+            bucket = self._buckets[key] = _Bucket()
+            bucket.words = bucket_words
+            bucket.positions = dict(zip(bucket_words, range(len(bucket_words))))
+
+    def add(self, word: str, topic: Optional[Hashable], level: Optional[Hashable]):
+        """Index a word under its topic and level"""
+        for key in self._keys(topic, level):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+            bucket.add(word)
+
+    def remove(self, word: str, topic: Optional[Hashable], level: Optional[Hashable]):
+        """Remove a word indexed under the given topic and level"""
+        for key in self._keys(topic, level):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.remove(word)
+            if not bucket.words:
+                del self._buckets[key]
+
+    def sample(
+        self,
+        word: str,
+        topic: Optional[Hashable],
+        level: Optional[Hashable],
+        count: int,
+        exclude: Iterable[str] = (),
+    ) -> List[str]:
+        """Draw up to count words other than word and exclude, preferring its topic and level"""
+        chosen: List[str] = []
+        for key in self._keys(topic, level):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                chosen += bucket.sample(count - len(chosen), {word, *exclude, *chosen})
+            if len(chosen) >= count:
+                break
+        return chosen
@@ -0,0 +1,118 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Get the number of single character edits that turn a into b"""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    # Myers' bit-parallel algorithm: one column of the DP table per character
+    # of a, held as bit vectors of +1/-1 steps over the characters of b
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    last_bit = 1 << (len(b) - 1)
+    full = (1 << len(b)) - 1
+    positive, negative = full, 0
+    distance = len(b)
+    for char in a:
+        match = masks.get(char, 0)
+        diagonal = (((match & positive) + positive) ^ positive) | match | negative
+        horizontal_positive = negative | ~(diagonal | positive)
+        horizontal_negative = positive & diagonal
+        if horizontal_positive & last_bit:
+            distance += 1
+        elif horizontal_negative & last_bit:
+            distance -= 1
+        horizontal_positive = ((horizontal_positive << 1) | 1) & full
+        horizontal_negative = (horizontal_negative << 1) & full
+        positive = horizontal_negative | ~(diagonal | horizontal_positive) & full
+        negative = horizontal_positive & diagonal
+    return distance
+
+
+class BKTree:
+    """Burkhard-Keller tree of words under edit distance.
+
+    Each child hangs off its parent by its distance to the parent's word, so
+    by the triangle inequality a search within distance d only descends into
+    children whose edge lies within d of the query's distance to the parent.
+    Deleted words stay in the tree as tombstones until they outnumber the
+    live words, then the tree is rebuilt.
+    """
+
+    def __init__(self):
+        # A node is [word, {distance to word: child node}]
+        self._root: Optional[list] = None
+        self._words: Set[str] = set()
+        self._tombstones: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def rebuild(self, words: Iterable[str]):
+        """Replace the tree with the given words"""
+        self._root = None
+        self._words = set()
+        self._tombstones = set()
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        """Insert a word, reviving it if it was deleted"""
+        if word in self._words:
+            return
+        self._words.add(word)
+        if word in self._tombstones:
+            self._tombstones.discard(word)
+            return
+        if self._root is None:
+            self._root = [word, {}]
+            return
+
+        node = self._root
+        while True:
+            distance = levenshtein(word, node[0])
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+            node = child
+
+    def remove(self, word: str):
+        """Delete a word; its node stays until the tree is rebuilt"""
+        if word not in self._words:
+            return
+        self._words.discard(word)
+        self._tombstones.add(word)
+        if len(self._tombstones) > len(self._words):
+            self.rebuild(list(self._words))
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Get (distance, word) pairs of all words within max_distance, closest first"""
+        matches = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= max_distance and node_word not in self._tombstones:
+                matches.append((distance, node_word))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        matches.sort()
+        return matches
+
+    def nearest(self, word: str, count: int, max_distance: int) -> List[str]:
+        """Get up to count other words within max_distance, closest first"""
+        return [match for _, match in self.search(word, max_distance) if match != word][
+            :count
+        ]
+
+
+def near_duplicate_distance(word: str) -> int:
+    """Get the edit distance within which another word counts as a near-duplicate"""
+    # Short words differ by one letter all the time (der/den), longer ones rarely
+    return 0 if len(word) <= 3 else 1 if len(word) <= 8 else 2
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from openai import BaseModel
+
+from polyglot.services.llm_provider import (
+    LlmChatCompletionResponse,
+    LlmProvider,
+    TokenUsage,
+)
+
+# Default bound on the stored responses, in bytes of JSON
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# Request parameters that change how a request is sent, not its response
+UNKEYED_PARAMS = {"deadline_seconds", "timeout"}
+
+
+class LlmResponseCache:
+    """On-disk store of parsed LLM responses, keyed by request.
+
+    Requests are keyed by a SHA-256 hash of the model, messages, response
+    format schema and sampling parameters, and their parsed responses are
+    stored in SQLite. When the stored responses outgrow max_bytes, the
+    least recently used ones are evicted; with a ttl_seconds, older
+    responses count as misses and are replaced.
+    """
+
+    def __init__(
+        self,
+        cache_file: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        cache_file.parent.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(cache_file, check_same_thread=False)
+        with self._lock, self.connection:
+            self.connection.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )"""
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed "
+                "ON responses (accessed)"
+            )
+            self._size = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def lookup(
+        self, model: str, messages: list[dict], response_format, params: Dict
+    ) -> Tuple[str, Optional[LlmChatCompletionResponse]]:
+        """Get the key of a request and its cached response, or None on a miss"""
+        key = self._key(model, messages, response_format, params)
+        cached = self._get(key)
+        if cached is None:
+            self.misses += 1
+            return key, None
+        self.hits += 1
+        # A cached answer costs no tokens
+        return key, LlmChatCompletionResponse(
+            dict_response=cached, usage=TokenUsage(0, 0, 0)
+        )
+
+    def store(
+        self, key: str, response: LlmChatCompletionResponse
+    ) -> LlmChatCompletionResponse:
+        """Store a fresh response and get it back with its parsed result as a dict"""
+        parsed = response.dict_response
+        if hasattr(parsed, "model_dump"):
+            parsed = parsed.model_dump(mode="json")
+        self._put(key, parsed)
+        return LlmChatCompletionResponse(dict_response=parsed, usage=response.usage)
+
+    def stats(self) -> Dict:
+        """Get the hit and miss counts and the size of the stored responses"""
+        with self._lock:
+            entries = self.connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "bytes": self._size,
+            }
+
+    def clear(self):
+        """Remove every stored response"""
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            self.connection.close()
+
+    def _key(
+        self, model: str, messages: list[dict], response_format, params: Dict
+    ) -> str:
+        """Hash everything that affects the response"""
+        schema = (
+            response_format.model_json_schema()
+            if hasattr(response_format, "model_json_schema")
+            else None
+        )
+        request = {
+            "model": model,
+            "messages": messages,
+            "response_format": schema,
+            "params": {
+                key: value
+                for key, value in params.items()
+                if value is not None and key not in UNKEYED_PARAMS
+            },
+        }
+        encoded = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Dict]:
+        """Get a stored response and mark it as used, or None if there is none"""
+        now = time.time()
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                "SELECT response, size, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, size, created = row
+            if self.ttl_seconds is not None and now - created > self.ttl_seconds:
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                return None
+            self.connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(response)
+
+    def _put(self, key: str, parsed: Dict):
+        """Store a response, evicting the least recently used ones beyond max_bytes"""
+        response = json.dumps(parsed, ensure_ascii=False)
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        with self._lock, self.connection:
+            previous = self.connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if previous is not None:
+                self._size -= previous[0]
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._size += size
+
+            while self._size > self.max_bytes:
+                evicted = self.connection.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed LIMIT 64"
+                ).fetchall()
+                for evicted_key, evicted_size in evicted:
+                    if self._size <= self.max_bytes:
+                        break
+                    self.connection.execute(
+                        "DELETE FROM responses WHERE key = ?", (evicted_key,)
+                    )
+                    self._size -= evicted_size
+
+
+def _model_name(provider: LlmProvider) -> str:
+    """Get the model a provider answers with, for cache keys"""
+    return getattr(provider, "model", type(provider).__name__)
+
+
+class CachedLlmProvider(LlmProvider):
+    """LLM provider that answers repeated requests from an LlmResponseCache"""
+
+    def __init__(self, provider: LlmProvider, cache: LlmResponseCache):
+        self.provider = provider
+        self.cache = cache
+
+    def get_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> LlmChatCompletionResponse:
+        key, cached = self.cache.lookup(
+            _model_name(self.provider), messages, response_format, kwargs
+        )
+        if cached is not None:
+            return cached
+        response = self.provider.get_chat_completion(
+            messages=messages, response_format=response_format, **kwargs
+        )
+        return self.cache.store(key, response)
+
+
+class CachedAsyncLlmProvider(LlmProvider):
+    """Async LLM provider that answers repeated requests from an LlmResponseCache"""
+
+    def __init__(self, provider: LlmProvider, cache: LlmResponseCache):
+        self.provider = provider
+        self.cache = cache
+
+    async def get_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> LlmChatCompletionResponse:
+        key, cached = self.cache.lookup(
+            _model_name(self.provider), messages, response_format, kwargs
+        )
+        if cached is not None:
+            return cached
+        response = await self.provider.get_chat_completion(
+            messages=messages, response_format=response_format, **kwargs
+        )
+        return self.cache.store(key, response)
+
+    async def stream_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> AsyncIterator[LlmChatCompletionResponse]:
+        """Stream a completion, or yield the cached response at once on a hit"""
+        key, cached = self.cache.lookup(
+            _model_name(self.provider), messages, response_format, kwargs
+        )
+        if cached is not None:
+            yield cached
+            return
+        async for response in self.provider.stream_chat_completion(
+            messages=messages, response_format=response_format, **kwargs
+        ):
+            if response.usage is None:
+                yield response
+            else:
+                yield self.cache.store(key, response)
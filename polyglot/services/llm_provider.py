@@ -1,9 +1,11 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
-from openai import OpenAI, BaseModel
+from jiter import from_json
+from openai import AsyncOpenAI, OpenAI, BaseModel
 
 
 class LlmProviders(Enum):
@@ -21,7 +23,8 @@ class TokenUsage:
 @dataclass
 class LlmChatCompletionResponse:
     dict_response: dict[str, Any]
-    usage: TokenUsage
+    # None for the partial responses of a stream
+    usage: Optional[TokenUsage]
 
 
 class LlmProvider(ABC):
@@ -41,9 +44,9 @@ class LlmProvider(ABC):
 
 
 class OpenAIProvider(LlmProvider):
-    def __init__(self, api_key: str, model: str):
+    def __init__(self, api_key: str, model: str, max_retries: int = 2):
         self.model = model
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(api_key=api_key, max_retries=max_retries)
 
     def get_chat_completion(
         self,
@@ -71,3 +74,96 @@ class OpenAIProvider(LlmProvider):
                 total_tokens=response.usage.total_tokens,
             ),
         )
+
+
+class AsyncOpenAIProvider(LlmProvider):
+    """OpenAI provider whose get_chat_completion is a coroutine.
+
+    At most max_concurrency requests are in flight at once; further calls
+    wait for a free slot, so many generation and grading calls can be
+    started without flooding the API.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        max_concurrency: int = 4,
+        max_retries: int = 2,
+    ):
+        self.model = model
+        self.client = AsyncOpenAI(api_key=api_key, max_retries=max_retries)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def get_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> LlmChatCompletionResponse:
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "response_format": response_format,
+        }
+
+        for key, value in kwargs.items():
+            if value is not None:
+                params[key] = value
+
+        async with self._semaphore:
+            response = await self.client.beta.chat.completions.parse(**params)
+
+        return LlmChatCompletionResponse(
+            dict_response=response.choices[0].message.parsed,
+            usage=TokenUsage(
+                completion_tokens=response.usage.completion_tokens,
+                prompt_tokens=response.usage.prompt_tokens,
+                total_tokens=response.usage.total_tokens,
+            ),
+        )
+
+    async def stream_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> AsyncIterator[LlmChatCompletionResponse]:
+        """Stream a completion as partial responses, then the parsed response with its usage.
+
+        Partial responses hold the fields parsed so far, with the string
+        being written cut where the stream is; their usage is None.
+        """
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "response_format": response_format,
+            "stream_options": {"include_usage": True},
+        }
+
+        for key, value in kwargs.items():
+            if value is not None:
+                params[key] = value
+
+        async with self._semaphore:
+            async with self.client.beta.chat.completions.stream(**params) as stream:
+                async for event in stream:
+                    # Nothing can be parsed before the first character of the JSON
+                    if event.type == "content.delta" and event.snapshot.strip():
+                        yield LlmChatCompletionResponse(
+                            dict_response=from_json(
+                                event.snapshot.encode("utf-8"),
+                                partial_mode="trailing-strings",
+                            ),
+                            usage=None,
+                        )
+                response = await stream.get_final_completion()
+
+        yield LlmChatCompletionResponse(
+            dict_response=response.choices[0].message.parsed,
+            usage=TokenUsage(
+                completion_tokens=response.usage.completion_tokens,
+                prompt_tokens=response.usage.prompt_tokens,
+                total_tokens=response.usage.total_tokens,
+            ),
+        )
@@ -0,0 +1,322 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import AsyncIterator, Optional, Tuple
+
+import openai
+from openai import BaseModel
+
+from polyglot.services.llm_provider import LlmChatCompletionResponse, LlmProvider
+
+# Errors worth retrying: rate limits, timeouts, dropped connections and 5xx
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when an LLM call cannot finish before its deadline"""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a rate per minute.
+
+    Taking tokens never blocks: the bucket may go into debt, and take()
+    returns how long the caller has to wait until the tokens it took would
+    have been available. Callers that wait that long never exceed the rate.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60
+        self.capacity = per_minute if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, amount: float) -> float:
+        """Take tokens and get the seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def give_back(self, amount: float):
+        """Return tokens that were taken but not used"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """Client-side limit on requests and tokens per minute"""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens: int) -> float:
+        """Reserve a request of the given size and get the seconds to wait before sending it"""
+        return max(self.requests.take(1), self.tokens.take(tokens))
+
+    def release(self, tokens: int):
+        """Return a reservation for a request that was not sent or not counted"""
+        self.requests.give_back(1)
+        self.tokens.give_back(tokens)
+
+    def settle(self, estimated: int, used: int):
+        """Correct the token bucket once the tokens a request used are known"""
+        if used < estimated:
+            self.tokens.give_back(estimated - used)
+        else:
+            self.tokens.take(used - estimated)
+
+
+def estimate_tokens(messages: list[dict], max_tokens: Optional[int]) -> int:
+    """Estimate the tokens a request counts against the limit: prompt plus max_tokens"""
+    # About 4 characters per token for English-like text
+    prompt = sum(len(str(message.get("content", ""))) for message in messages) // 4
+    return prompt + (max_tokens or 0)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that honors Retry-After"""
+
+    def __init__(
+        self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Get the seconds to wait before retry number attempt (0-based)"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_after = _retry_after(error)
+        # The server knows best when it will accept the request again
+        return backoff if retry_after is None else max(retry_after, backoff)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Get the wait a rate limited response asked for, in seconds, if any"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    # Retry-After may also be an HTTP date
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class _Resilience:
+    """Rate limiting, retries and deadlines shared by the sync and async wrappers"""
+
+    def __init__(
+        self,
+        provider: LlmProvider,
+        limiter: RateLimiter,
+        retry_policy: RetryPolicy,
+        deadline_seconds: float,
+    ):
+        self.provider = provider
+        self.model = getattr(provider, "model", None)
+        self.limiter = limiter
+        self.retry_policy = retry_policy
+        self.deadline_seconds = deadline_seconds
+
+    def _deadline(self, kwargs: dict) -> float:
+        """Get the monotonic time a call must finish by, taking a per-call override"""
+        seconds = kwargs.pop("deadline_seconds", None) or self.deadline_seconds
+        return time.monotonic() + seconds
+
+    def _reserve(self, estimated: int, deadline: float) -> Tuple[float, float]:
+        """Reserve an attempt with the rate limiter; get its wait and the time left after it"""
+        wait = self.limiter.acquire(estimated)
+        try:
+            return wait, self._check_wait(wait, deadline)
+        except DeadlineExceededError:
+            # The attempt is never sent, so later requests may use its share
+            self.limiter.release(estimated)
+            raise
+
+    def _check_wait(self, wait: float, deadline: float, error=None) -> float:
+        """Make sure waiting still leaves time for the request; get the time left after it"""
+        remaining = deadline - time.monotonic() - wait
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                "LLM request could not finish before its deadline"
+            ) from error
+        return remaining
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """Check if an error is transient and retries are left"""
+        return (
+            isinstance(error, RETRYABLE_ERRORS)
+            and attempt < self.retry_policy.max_retries
+        )
+
+    def _settle(self, estimated: int, response: LlmChatCompletionResponse):
+        """Correct the rate limiter with the tokens the request actually used"""
+        if response.usage is not None:
+            self.limiter.settle(estimated, response.usage.total_tokens)
+
+
+class ResilientLlmProvider(_Resilience, LlmProvider):
+    """LLM provider that throttles, retries transient errors and enforces deadlines.
+
+    Each attempt first waits for the rate limiter, so bursts are spread
+    out instead of being answered with 429s. Rate limits, timeouts,
+    connection errors and server errors are retried with jittered
+    exponential backoff, waiting at least as long as a Retry-After header
+    asks. A call gives up with DeadlineExceededError once waiting would
+    take it past its deadline, and each attempt's timeout is the time left.
+    """
+
+    def __init__(
+        self,
+        provider: LlmProvider,
+        limiter: RateLimiter,
+        retry_policy: Optional[RetryPolicy] = None,
+        deadline_seconds: float = 60.0,
+    ):
+        super().__init__(
+            provider, limiter, retry_policy or RetryPolicy(), deadline_seconds
+        )
+
+    def get_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> LlmChatCompletionResponse:
+        deadline = self._deadline(kwargs)
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens"))
+        attempt = 0
+        while True:
+            wait, timeout = self._reserve(estimated, deadline)
+            time.sleep(wait)
+            try:
+                response = self.provider.get_chat_completion(
+                    messages=messages,
+                    response_format=response_format,
+                    timeout=timeout,
+                    **kwargs,
+                )
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    self.limiter.release(estimated)
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                self._check_wait(delay, deadline, e)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._settle(estimated, response)
+            return response
+
+
+class ResilientAsyncLlmProvider(_Resilience, LlmProvider):
+    """Async counterpart of ResilientLlmProvider; waits without blocking the event loop"""
+
+    def __init__(
+        self,
+        provider: LlmProvider,
+        limiter: RateLimiter,
+        retry_policy: Optional[RetryPolicy] = None,
+        deadline_seconds: float = 60.0,
+    ):
+        super().__init__(
+            provider, limiter, retry_policy or RetryPolicy(), deadline_seconds
+        )
+
+    async def get_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> LlmChatCompletionResponse:
+        deadline = self._deadline(kwargs)
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens"))
+        attempt = 0
+        while True:
+            wait, timeout = self._reserve(estimated, deadline)
+            await asyncio.sleep(wait)
+            try:
+                response = await self.provider.get_chat_completion(
+                    messages=messages,
+                    response_format=response_format,
+                    timeout=timeout,
+                    **kwargs,
+                )
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    self.limiter.release(estimated)
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                self._check_wait(delay, deadline, e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._settle(estimated, response)
+            return response
+
+    async def stream_chat_completion(
+        self,
+        messages: list[dict],
+        response_format: BaseModel = None,
+        **kwargs,
+    ) -> AsyncIterator[LlmChatCompletionResponse]:
+        """Stream a completion, retrying only while nothing has been streamed yet"""
+        deadline = self._deadline(kwargs)
+        estimated = estimate_tokens(messages, kwargs.get("max_tokens"))
+        attempt = 0
+        while True:
+            wait, timeout = self._reserve(estimated, deadline)
+            await asyncio.sleep(wait)
+            streamed = False
+            try:
+                async for response in self.provider.stream_chat_completion(
+                    messages=messages,
+                    response_format=response_format,
+                    timeout=timeout,
+                    **kwargs,
+                ):
+                    streamed = True
+                    self._settle(estimated, response)
+                    yield response
+            except Exception as e:
+                # Partial output has been shown, so a retry would repeat it
+                if streamed or not self._should_retry(e, attempt):
+                    # A stream that broke off has used tokens, so only an
+                    # unanswered request gives its reservation back
+                    if not streamed:
+                        self.limiter.release(estimated)
+                    raise
+                delay = self.retry_policy.delay(attempt, e)
+                self._check_wait(delay, deadline, e)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            return
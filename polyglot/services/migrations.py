@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+
+@dataclass
+class Migration:
+    version: int
+    description: str
+    # Takes the data at version - 1 and returns it at this version
+    apply: Callable[[Any], Any]
+
+
+def run_migrations(migrations: List[Migration], data: Any, version: int) -> Any:
+    """Apply all migrations newer than the given version, oldest first"""
+    for migration in migrations:
+        if migration.version > version:
+            data = migration.apply(data)
+    return data
+
+
+def _fill_missing_stats(vocabulary: pd.DataFrame) -> pd.DataFrame:
+    """Add missing stat columns and fill missing stat values"""
+    # Words that were never practiced count as practiced at migration time
+    now = pd.Timestamp.now()
+    if "last_practiced" in vocabulary.columns:
+        vocabulary["last_practiced"] = pd.to_datetime(
+            vocabulary["last_practiced"], format="ISO8601", errors="coerce"
+        ).fillna(now)
+    else:
+        vocabulary["last_practiced"] = now
+
+    for col, default in {
+        "correct_answers": 0,
+        "times_practiced": 0,
+        "viewed": False,
+    }.items():
+        if col in vocabulary.columns:
+            vocabulary[col] = vocabulary[col].where(vocabulary[col].notna(), default)
+        else:
+            vocabulary[col] = default
+    return vocabulary
+
+
+def _add_review_schedule(vocabulary: pd.DataFrame) -> pd.DataFrame:
+    """Add the spaced repetition columns, with every seen word due for review"""
+    # Seen words became due when they were last practiced, so the oldest come first
+    seen = vocabulary["viewed"].eq(True) | (vocabulary["times_practiced"] > 0)
+    for col, default in {
+        "interval": 0.0,
+        "ease": 2.5,
+        "due": vocabulary["last_practiced"].where(seen),
+    }.items():
+        if col in vocabulary.columns:
+            vocabulary[col] = vocabulary[col].where(vocabulary[col].notna(), default)
+        else:
+            vocabulary[col] = default
+    return vocabulary
+
+
+VOCABULARY_MIGRATIONS = [
+    Migration(1, "Fill missing stat columns and values", _fill_missing_stats),
+    Migration(2, "Add the spaced repetition schedule", _add_review_schedule),
+]
+VOCABULARY_VERSION = VOCABULARY_MIGRATIONS[-1].version
+
+
+def _add_missing_settings(settings: Dict) -> Dict:
+    """Add the settings introduced since the first release with their defaults"""
+    return {
+        "include_phrases": True,
+        "words_per_day": 5,
+        "flashcard_delay": 5,
+        "test_word_count": 10,
+        "min_practice_count": 7,
+        "min_success_rate": 75,
+        "storage_backend": "csv",
+        **settings,
+    }
+
+
+def _add_selection_strategy(settings: Dict) -> Dict:
+    """Add the word selection strategy, keeping the original selection"""
+    return {"selection_strategy": "balanced", **settings}
+
+
+def _add_translation_grading(settings: Dict) -> Dict:
+    """Add the translation grading mode, keeping the check after each sentence"""
+    return {"translation_grading": "each", **settings}
+
+
+def _add_article_stripping(settings: Dict) -> Dict:
+    """Add the article stripping switch, off so that only exact duplicates are rejected"""
+    return {"strip_articles": False, **settings}
+
+
+SETTINGS_MIGRATIONS = [
+    Migration(1, "Add missing settings with their defaults", _add_missing_settings),
+    Migration(2, "Add the word selection strategy", _add_selection_strategy),
+    Migration(3, "Add the translation grading mode", _add_translation_grading),
+    Migration(4, "Add the article stripping switch", _add_article_stripping),
+]
+SETTINGS_VERSION = SETTINGS_MIGRATIONS[-1].version
+
+
+def migrate_vocabulary(vocabulary: pd.DataFrame, version: int) -> pd.DataFrame:
+    """Bring a vocabulary loaded at the given schema version up to date"""
+    return run_migrations(VOCABULARY_MIGRATIONS, vocabulary, version)
+
+
+def migrate_settings(settings: Dict, version: int) -> Dict:
+    """Bring user settings loaded at the given schema version up to date"""
+    settings = run_migrations(SETTINGS_MIGRATIONS, settings, version)
+    settings["schema_version"] = SETTINGS_VERSION
+    return settings
@@ -0,0 +1,54 @@
+import unicodedata
+from typing import Dict, List, Optional
+
+# Leading words dropped from a word's key when articles are stripped, by
+# target language, so that "das Haus" and "Haus" count as the same word.
+# English "a" and "to" are left out: "a lot" and "to be" are words of their own
+ARTICLES: Dict[str, List[str]] = {
+    "English": ["the", "an"],
+    "Spanish": ["el", "la", "los", "las", "un", "una", "unos", "unas"],
+    "French": ["le", "la", "les", "un", "une", "des", "du"],
+    "German": [
+        "der",
+        "die",
+        "das",
+        "den",
+        "dem",
+        "des",
+        "ein",
+        "eine",
+        "einen",
+        "einem",
+        "einer",
+        "eines",
+    ],
+    "Italian": ["il", "lo", "la", "i", "gli", "le", "un", "uno", "una"],
+    "Portuguese": ["o", "a", "os", "as", "um", "uma", "uns", "umas"],
+}
+
+# Articles written against the word, as in "l'homme"
+ELIDED_ARTICLES: Dict[str, List[str]] = {
+    "French": ["l'"],
+    "Italian": ["l'", "un'"],
+}
+
+# Punctuation around a word that does not change it, as in a typed "Haus."
+SURROUNDING_PUNCTUATION = ".,;:!?¡¿\"'«»„“”"
+
+
+def normalize_word(
+    text: str, language: Optional[str] = None, strip_articles: bool = False
+) -> str:
+    """Get the key shared by spellings of a word that differ in case, Unicode form, spacing or, optionally, article"""
+    key = unicodedata.normalize("NFKC", text).casefold().replace("’", "'")
+    key = " ".join(key.split()).strip(SURROUNDING_PUNCTUATION)
+    if not strip_articles:
+        return key
+
+    first, _, rest = key.partition(" ")
+    if rest and first in ARTICLES.get(language, []):
+        return rest
+    for article in ELIDED_ARTICLES.get(language, []):
+        if key.startswith(article) and len(key) > len(article):
+            return key[len(article) :]
+    return key
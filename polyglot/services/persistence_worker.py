@@ -0,0 +1,70 @@
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+
+class PersistenceWorker:
+    """Background thread that turns bursts of changes into debounced flushes.
+
+    Callers mark their state dirty after mutating it; the worker waits
+    ``interval_ms`` so further changes can pile up, then calls ``flush_fn``
+    once for all of them. ``flush()`` writes synchronously, e.g. on shutdown.
+    """
+
+    def __init__(self, flush_fn: Callable[[], None], interval_ms: int = 500):
+        self.flush_fn = flush_fn
+        self.interval = interval_ms / 1000
+        self._dirty = threading.Event()
+        self._stopped = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def mark_dirty(self):
+        """Schedule a flush for the next debounce interval"""
+        self._dirty.set()
+
+    def flush(self):
+        """Write pending changes now, in the calling thread"""
+        with self._flush_lock:
+            self._dirty.clear()
+            try:
+                self.flush_fn()
+            except Exception as e:
+                print(f"Error writing changes to disk: {e}")
+
+    def stop(self, flush: bool = True):
+        """Stop the worker thread, after a final flush unless flush is False"""
+        self._stopped.set()
+        self._dirty.set()
+        if not flush:
+            # Don't wait for a flush in progress either; the thread is a daemon
+            return
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._dirty.wait()
+            # Let further changes pile up before writing
+            self._stopped.wait(self.interval)
+            # Once stopped, stop() does the final flush if there is one
+            if not self._stopped.is_set():
+                self.flush()
+
+
+@contextmanager
+def atomic_path(path: Path):
+    """Yield a temporary path that replaces ``path`` only if writing succeeds"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        yield tmp_path
+        # Make sure the data is on disk before the rename makes it visible
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            os.remove(tmp_path)
@@ -0,0 +1,75 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+
+class PracticeJournal:
+    """Append-only log of per-word stat changes.
+
+    Each record stores the absolute state of the changed columns for one word,
+    so replaying the journal is idempotent and only the last record per word
+    matters. The journal is folded back into the vocabulary snapshot by
+    compaction once it grows past ``compaction_threshold`` records.
+    """
+
+    def __init__(self, path: Path, compaction_threshold: int = 500):
+        self.path = path
+        self.rotated_path = path.with_name(path.name + ".compacting")
+        self.compaction_threshold = compaction_threshold
+        self.record_count = 0
+
+    def append_many(self, records: List[Dict]):
+        """Append several records with a single write"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        self.record_count += len(records)
+
+    def read(self) -> List[Dict]:
+        """Read all records, including a journal left over from an unfinished compaction"""
+        records = []
+        for path in (self.rotated_path, self.path):
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append; skip it
+                        continue
+        self.record_count = len(records)
+        return records
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Check if the journal has grown past the compaction threshold"""
+        return self.record_count >= self.compaction_threshold
+
+    def rotate(self):
+        """Move the current journal aside so new records go to a fresh file"""
+        if self.path.exists():
+            if self.rotated_path.exists():
+                # Previous compaction never finished; keep its records first
+                with open(self.rotated_path, "a", encoding="utf-8") as dst:
+                    with open(self.path, "r", encoding="utf-8") as src:
+                        dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.record_count = 0
+
+    def discard_rotated(self):
+        """Remove the rotated journal once its records are in the snapshot"""
+        if self.rotated_path.exists():
+            os.remove(self.rotated_path)
+
+    def clear(self):
+        """Remove all journal files after a full snapshot has been written"""
+        for path in (self.path, self.rotated_path):
+            if path.exists():
+                os.remove(path)
+        self.record_count = 0
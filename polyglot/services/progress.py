@@ -0,0 +1,53 @@
+from enum import IntEnum
+
+import numpy as np
+
+
+class LearningStatus(IntEnum):
+    NOT_STARTED = 0  # Never practiced
+    NEEDS_PRACTICE = 1  # Practiced with a low success rate
+    IN_PROGRESS = 2  # Practiced with good progress
+    LEARNT = 3  # Meets the minimum practice and success criteria
+
+
+# Success rate (%) below which a practiced word needs practice
+NEEDS_PRACTICE_RATE = 60
+
+
+def success_rates(
+    times_practiced: np.ndarray, correct_answers: np.ndarray
+) -> np.ndarray:
+    """Get the share of correct answers per word, 0 for words never practiced"""
+    return np.divide(
+        correct_answers,
+        times_practiced,
+        out=np.zeros(len(times_practiced)),
+        where=times_practiced > 0,
+    )
+
+
+def learning_statuses(
+    times_practiced: np.ndarray,
+    correct_answers: np.ndarray,
+    min_practice_count: int,
+    min_success_rate: float,
+) -> np.ndarray:
+    """Get the LearningStatus of each word, given the minimum success rate in %"""
+    times_practiced = times_practiced.astype(np.int64)
+    # Compare counts instead of rates so thresholds like 70% are exact
+    correct = correct_answers.astype(np.int64) * 100
+    practiced = times_practiced > 0
+    return np.select(
+        [
+            (times_practiced >= min_practice_count)
+            & (correct >= min_success_rate * times_practiced),
+            practiced & (correct < NEEDS_PRACTICE_RATE * times_practiced),
+            practiced,
+        ],
+        [
+            LearningStatus.LEARNT,
+            LearningStatus.NEEDS_PRACTICE,
+            LearningStatus.IN_PROGRESS,
+        ],
+        default=LearningStatus.NOT_STARTED,
+    ).astype(np.int8)
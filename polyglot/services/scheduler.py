@@ -0,0 +1,99 @@
+import heapq
+from enum import Enum
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+
+class SelectionStrategies(Enum):
+    # Half least practiced, half longest ago practiced words
+    BALANCED = "balanced"
+    # The words whose spaced repetition review is due first
+    SPACED_REPETITION = "spaced_repetition"
+
+
+# SM-2 parameters; practice answers are graded 4 when correct and 2 when wrong
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+CORRECT_GRADE = 4
+INCORRECT_GRADE = 2
+# Intervals (days) of the first two successful reviews, before ease applies
+FIRST_INTERVALS = [1.0, 6.0]
+
+
+def sm2_review(interval: float, ease: float, correct: bool) -> Tuple[float, float]:
+    """Get a word's next review interval in days and its new ease after an answer"""
+    grade = CORRECT_GRADE if correct else INCORRECT_GRADE
+    miss = 5 - grade
+    ease = max(MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02))
+
+    # A wrong answer starts the word's review sequence over
+    if not correct:
+        return FIRST_INTERVALS[0], ease
+    for first_interval in FIRST_INTERVALS:
+        if interval < first_interval:
+            return first_interval, ease
+    return round(interval * ease), ease
+
+
+class DueQueue:
+    """Min-heap of words ordered by the time their next review is due.
+
+    Rescheduling a word pushes a new entry instead of searching the heap for
+    the old one; outdated entries are recognized by comparing them with the
+    word's current due time and dropped once they reach the top, so taking
+    the next k words costs O(k log n).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, str]] = []
+        # Current due time of each queued word, in nanoseconds
+        self._due: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def rebuild(self, words: Iterable[str], due: pd.Series):
+        """Replace the queue with the given words and due times, skipping unscheduled words"""
+        scheduled = due.notna().to_numpy()
+        self._due = dict(
+            zip(
+                pd.Series(words)[scheduled].tolist(),
+                due[scheduled].to_numpy("datetime64[ns]").astype("int64").tolist(),
+            )
+        )
+        self._compact()
+
+    def push(self, word: str, due: pd.Timestamp):
+        """Schedule a word, replacing its previous due time"""
+        entry = (pd.Timestamp(due).value, word)
+        self._due[word] = entry[0]
+        heapq.heappush(self._heap, entry)
+        # Don't let outdated entries outnumber the live ones
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._compact()
+
+    def remove(self, word: str):
+        """Unschedule a word; its heap entries are dropped lazily"""
+        self._due.pop(word, None)
+
+    def first(self, count: int) -> List[str]:
+        """Get the count words due first, most overdue first, without dequeuing them"""
+        selected = []
+        seen = set()
+        while self._heap and len(selected) < count:
+            entry = heapq.heappop(self._heap)
+            due_ns, word = entry
+            # Drop outdated and repeated entries for good
+            if self._due.get(word) != due_ns or word in seen:
+                continue
+            seen.add(word)
+            selected.append(entry)
+        for entry in selected:
+            heapq.heappush(self._heap, entry)
+        return [word for _, word in selected]
+
+    def _compact(self):
+        """Rebuild the heap from the live entries only"""
+        self._heap = [(due_ns, word) for word, due_ns in self._due.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,122 @@
+import json
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from polyglot.services.persistence_worker import PersistenceWorker, atomic_path
+
+
+class SessionKinds(Enum):
+    FLASHCARDS = "flashcards"
+    WORD_TEST = "word_test"
+    SENTENCE_TEST = "sentence_test"
+    TRANSLATION = "translation"
+
+
+class SessionPlanner:
+    """Precomputes the words of the next practice sessions in the background.
+
+    Any change to the vocabulary or settings throws the plan away; once
+    changes settle, a background worker selects the words of every session
+    again and writes them to ``plan_file``. The UI thread then only looks
+    up the planned words, also for the first session after a restart. A
+    stored plan is used only while the fingerprint of the data it was
+    planned from still matches.
+
+    The lock is held only to take a snapshot of the data and to publish
+    the plan; the words are selected from the snapshot without it, and a
+    plan that was invalidated in the meantime is thrown away. ``warm_fn``,
+    if given, runs at the start of every pass to build slow lookup indexes
+    away from the UI thread.
+    """
+
+    def __init__(
+        self,
+        plan_file: Path,
+        snapshot_fn: Callable[[], Any],
+        select_fn: Callable[[SessionKinds, Any], List[str]],
+        fingerprint_fn: Callable[[Any], Dict],
+        lock,
+        interval_ms: int = 2000,
+        warm_fn: Optional[Callable[[], None]] = None,
+    ):
+        self.plan_file = plan_file
+        self.snapshot_fn = snapshot_fn
+        self.select_fn = select_fn
+        self.fingerprint_fn = fingerprint_fn
+        self.warm_fn = warm_fn
+        # Guards the queues and the snapshot; never held while selecting
+        self._lock = lock
+        # Bumped by every invalidate(), to recognize plans made from stale data
+        self._generation = 0
+        self._queues: Dict[str, List[str]] = self._read_plan()
+        self.worker = PersistenceWorker(self._plan, interval_ms)
+        # Run one pass even when the stored plan is complete, so the indexes
+        # warm_fn builds are ready before the first session
+        self.worker.mark_dirty()
+
+    def _read_plan(self) -> Dict[str, List[str]]:
+        """Read the stored plan if it was planned from the current data"""
+        if not self.plan_file.exists():
+            return {}
+        try:
+            with open(self.plan_file, "r", encoding="utf-8") as f:
+                plan = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading session plan: {e}")
+            return {}
+        with self._lock:
+            snapshot = self.snapshot_fn()
+        if plan.get("fingerprint") != self.fingerprint_fn(snapshot):
+            return {}
+        return plan.get("queues", {})
+
+    def take(self, session: SessionKinds) -> Optional[List[str]]:
+        """Get the planned words of a session, or None if it is not planned yet"""
+        with self._lock:
+            words = self._queues.pop(session.value, None)
+        # Plan the session after this one
+        self.worker.mark_dirty()
+        return words
+
+    def invalidate(self):
+        """Throw the plan away and plan again once changes settle"""
+        with self._lock:
+            self._queues.clear()
+            self._generation += 1
+        self.worker.mark_dirty()
+
+    def close(self):
+        """Stop the worker without planning again; finished plans are already stored"""
+        self.worker.stop(flush=False)
+
+    def _plan(self):
+        """Select the words of unplanned sessions; runs on the worker"""
+        if self.warm_fn is not None:
+            self.warm_fn()
+        with self._lock:
+            missing = [
+                session for session in SessionKinds if session.value not in self._queues
+            ]
+            if not missing:
+                return
+            generation = self._generation
+            snapshot = self.snapshot_fn()
+
+        queues = {
+            session.value: self.select_fn(session, snapshot) for session in missing
+        }
+        fingerprint = self.fingerprint_fn(snapshot)
+
+        with self._lock:
+            if self._generation != generation:
+                # The data changed while planning; invalidate() scheduled a new plan
+                return
+            for session, words in queues.items():
+                self._queues.setdefault(session, words)
+            plan = {"fingerprint": fingerprint, "queues": dict(self._queues)}
+
+        # An outdated file is harmless: its fingerprint no longer matches
+        self.plan_file.parent.mkdir(exist_ok=True)
+        with atomic_path(self.plan_file) as tmp_path:
+            tmp_path.write_text(json.dumps(plan), encoding="utf-8")
@@ -0,0 +1,892 @@
+import ast
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # Only needed for the arrow storage backend
+    pa = None
+
+from polyglot.services.persistence_worker import atomic_path
+from polyglot.services.practice_journal import PracticeJournal
+
+
+VOCABULARY_COLUMNS = [
+    "word",
+    "translation",
+    "example",
+    "example_translation",
+    "times_practiced",
+    "correct_answers",
+    "topic",
+    "level",
+    "sentence_to_fill",
+    "sentence_to_fill_translation",
+    "options",
+    "correct_answer",
+    "viewed",
+    "last_practiced",
+    "interval",
+    "ease",
+    "due",
+]
+
+# Long text columns that lazy storages only read for the rows about to be shown
+DETAIL_COLUMNS = [
+    "example",
+    "example_translation",
+    "sentence_to_fill",
+    "sentence_to_fill_translation",
+    "options",
+]
+SUMMARY_COLUMNS = [name for name in VOCABULARY_COLUMNS if name not in DETAIL_COLUMNS]
+
+# On disk the four multiple choice options are stored as plain text columns
+OPTION_COLUMNS = ["option_1", "option_2", "option_3", "option_4"]
+
+
+def _stored_columns(columns: List[str]) -> List[str]:
+    """Expand the options column into the stored option columns"""
+    return [
+        column
+        for name in columns
+        for column in (OPTION_COLUMNS if name == "options" else [name])
+    ]
+
+
+STORED_COLUMNS = _stored_columns(VOCABULARY_COLUMNS)
+STORED_DETAIL_COLUMNS = _stored_columns(DETAIL_COLUMNS)
+
+# Declared dtypes of the in-memory vocabulary; the other columns hold strings
+VOCABULARY_DTYPES = {
+    "times_practiced": "int32",
+    "correct_answers": "int32",
+    "topic": "category",
+    "level": "category",
+    "viewed": "bool",
+    "last_practiced": "datetime64[ns]",
+    "interval": "float32",
+    "ease": "float32",
+    "due": "datetime64[ns]",
+}
+CATEGORY_COLUMNS = ["topic", "level"]
+# Stored as ISO format strings by the text storages
+TIMESTAMP_COLUMNS = ["last_practiced", "due"]
+# Read from CSV snapshots as strings: the text columns, the timestamps that
+# are parsed afterwards and the options of files written before the split
+CSV_TEXT_DTYPES = {
+    column: str
+    for column in STORED_COLUMNS + ["options"]
+    if column not in VOCABULARY_DTYPES or column in TIMESTAMP_COLUMNS
+}
+# The only columns that are modified in place; all others are replaced wholesale
+STAT_COLUMNS = [
+    "times_practiced",
+    "correct_answers",
+    "viewed",
+    "last_practiced",
+    "interval",
+    "ease",
+    "due",
+]
+
+# Rows serialized at a time, so writing never duplicates the whole table
+WRITE_CHUNK_SIZE = 10000
+
+
+class StorageBackends(Enum):
+    CSV = "csv"
+    SQLITE = "sqlite"
+    ARROW = "arrow"
+
+
+class ChangeKind(Enum):
+    UPDATE = "update"
+    ADD = "add"
+    DELETE = "delete"
+    SAVE = "save"
+
+
+@dataclass
+class VocabularyChange:
+    kind: ChangeKind
+    # UPDATE: a stats record, ADD: a DataFrame of new rows, DELETE: a word
+    data: Any = None
+
+
+class VocabularyStorage(ABC):
+    """Persistence interface for the vocabulary table.
+
+    The controller keeps the whole vocabulary in a DataFrame and queues the
+    changes it makes to it; storages decide how those changes reach the
+    disk. Writes are expected to come from a single thread at a time.
+    """
+
+    # Whether load() leaves out DETAIL_COLUMNS, which then come from load_details()
+    lazy_details = False
+
+    @abstractmethod
+    def exists(self) -> bool:
+        pass
+
+    @abstractmethod
+    def load(self) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def save(self, vocabulary: pd.DataFrame):
+        pass
+
+    @abstractmethod
+    def write_changes(
+        self, vocabulary: Optional[pd.DataFrame], changes: List[VocabularyChange]
+    ):
+        pass
+
+    @abstractmethod
+    def read_schema_version(self) -> int:
+        pass
+
+    @abstractmethod
+    def write_schema_version(self, version: int):
+        pass
+
+    @abstractmethod
+    def load_details(self, words: List[str]) -> pd.DataFrame:
+        """Read the detail columns of the given words, indexed by word"""
+
+    def needs_snapshot(self, changes: List[VocabularyChange]) -> bool:
+        """Check if write_changes needs a copy of the whole vocabulary"""
+        return any(change.kind == ChangeKind.SAVE for change in changes)
+
+    def import_csv(self, csv_storage: "CsvVocabularyStorage"):
+        """One-shot import of an existing CSV vocabulary, journal included"""
+        self.save(csv_storage.load())
+        self.write_schema_version(csv_storage.read_schema_version())
+
+
+def apply_vocabulary_dtypes(vocabulary: pd.DataFrame) -> pd.DataFrame:
+    """Cast the vocabulary columns to the declared dtypes, skipping those already cast"""
+    dtypes = {
+        col: dtype
+        for col, dtype in VOCABULARY_DTYPES.items()
+        if col in vocabulary.columns and vocabulary[col].dtype != dtype
+    }
+    return vocabulary.astype(dtypes) if dtypes else vocabulary
+
+
+def _empty_details() -> pd.DataFrame:
+    """Detail columns for no words, as returned by load_details"""
+    return pd.DataFrame(columns=DETAIL_COLUMNS, index=pd.Index([], name="word"))
+
+
+def _parse_timestamps(vocabulary: pd.DataFrame) -> pd.DataFrame:
+    """Parse the ISO format strings text storages keep in the timestamp columns"""
+    for col in TIMESTAMP_COLUMNS:
+        if col in vocabulary.columns:
+            vocabulary[col] = pd.to_datetime(
+                vocabulary[col], format="ISO8601", errors="coerce"
+            )
+    return vocabulary
+
+
+def _serialize_for_storage(vocabulary: pd.DataFrame) -> pd.DataFrame:
+    """Convert list and datetime cells into columns that round-trip through text storage"""
+    # Build the stored columns side by side instead of copying and patching the table
+    columns = {}
+    for name in vocabulary.columns:
+        # Columns the controller derives in memory are not stored
+        if name not in VOCABULARY_COLUMNS:
+            continue
+        if name == "options":
+            columns.update(_split_options(vocabulary["options"]))
+        elif name in TIMESTAMP_COLUMNS:
+            columns[name] = _format_timestamps(vocabulary[name])
+        else:
+            columns[name] = vocabulary[name]
+    return pd.DataFrame(columns, index=vocabulary.index)
+
+
+def _split_options(options: pd.Series) -> Dict[str, List]:
+    """Split the options lists into the values of each stored option column"""
+    count = len(OPTION_COLUMNS)
+    missing = [None] * count
+    rows = [
+        (option + missing)[:count] if isinstance(option, list) else missing
+        for option in options
+    ]
+    # Transpose the rows into one list per option column
+    columns = zip(*rows) if rows else [()] * count
+    return {column: list(values) for column, values in zip(OPTION_COLUMNS, columns)}
+
+
+def _format_timestamps(timestamps: pd.Series) -> pd.Series:
+    """Format timestamps as ISO format strings, with None for missing ones"""
+    # Vocabularies imported from old files may still hold strings
+    timestamps = pd.to_datetime(timestamps, errors="coerce")
+    text = np.datetime_as_string(timestamps.to_numpy("datetime64[us]"), unit="us")
+    return pd.Series(text, index=timestamps.index, dtype=object).where(
+        timestamps.notna(), None
+    )
+
+
+def _chunks(vocabulary: pd.DataFrame):
+    """Slice the vocabulary into chunks of rows to serialize one at a time"""
+    # Always yield at least one, possibly empty, chunk so headers get written
+    for start in range(0, max(len(vocabulary), 1), WRITE_CHUNK_SIZE):
+        yield vocabulary.iloc[start : start + WRITE_CHUNK_SIZE]
+
+
+def _journal_rows(rows: pd.DataFrame) -> List[Dict]:
+    """Convert added rows into JSON serializable dicts for the practice journal"""
+    rows = _serialize_for_storage(rows).astype(object)
+    return rows.where(rows.notna(), None).to_dict("records")
+
+
+def _join_options(vocabulary: pd.DataFrame) -> pd.DataFrame:
+    """Combine the stored option columns back into an options list column"""
+    if "options" in vocabulary.columns:
+        # Files written before options were split store the list's repr
+        vocabulary["options"] = vocabulary["options"].apply(
+            lambda x: ast.literal_eval(x) if isinstance(x, str) else x
+        )
+        return vocabulary
+
+    if all(column in vocabulary.columns for column in OPTION_COLUMNS):
+        position = vocabulary.columns.get_loc(OPTION_COLUMNS[0])
+        options = vocabulary[OPTION_COLUMNS].to_numpy(dtype=object).tolist()
+        vocabulary = vocabulary.drop(columns=OPTION_COLUMNS)
+        vocabulary.insert(position, "options", options)
+    return vocabulary
+
+
+class SnapshotVocabularyStorage(VocabularyStorage):
+    """Vocabulary stored as a snapshot file plus a practice journal.
+
+    Stat changes, added and deleted words are appended to the journal and
+    folded into the snapshot once it grows too long, so each flush only
+    writes the rows that changed.
+    """
+
+    def __init__(self, snapshot_file: Path, journal_file: Path):
+        self.snapshot_file = snapshot_file
+        self.version_file = snapshot_file.with_name(snapshot_file.name + ".version")
+        self.journal = PracticeJournal(journal_file)
+
+    @abstractmethod
+    def _read_snapshot(self) -> pd.DataFrame:
+        pass
+
+    @abstractmethod
+    def _write_snapshot_file(self, path: Path, vocabulary: pd.DataFrame):
+        pass
+
+    def exists(self) -> bool:
+        return self.snapshot_file.exists()
+
+    def read_schema_version(self) -> int:
+        # Snapshots written before versioning have no version file
+        if not self.version_file.exists():
+            return 0
+        return int(self.version_file.read_text())
+
+    def write_schema_version(self, version: int):
+        with atomic_path(self.version_file) as tmp_path:
+            tmp_path.write_text(str(version))
+
+    def load(self) -> pd.DataFrame:
+        """Read the snapshot and replay journaled stat changes on top of it"""
+        return _apply_journal(self._read_snapshot(), self.journal.read())
+
+    def save(self, vocabulary: pd.DataFrame):
+        """Write a full snapshot; the journal is no longer needed afterwards"""
+        # Write to a temporary file first so a crash never leaves a torn snapshot
+        with atomic_path(self.snapshot_file) as tmp_path:
+            self._write_snapshot_file(tmp_path, vocabulary)
+        self.journal.clear()
+
+    def needs_snapshot(self, changes: List[VocabularyChange]) -> bool:
+        records = sum(
+            len(change.data) if change.kind == ChangeKind.ADD else 1
+            for change in changes
+        )
+        return (
+            not self.exists()
+            or super().needs_snapshot(changes)
+            or self.journal.record_count + records >= self.journal.compaction_threshold
+        )
+
+    def write_changes(
+        self, vocabulary: Optional[pd.DataFrame], changes: List[VocabularyChange]
+    ):
+        # A snapshot of the current vocabulary already contains every change
+        if not self.exists() or any(
+            change.kind == ChangeKind.SAVE for change in changes
+        ):
+            self.save(vocabulary)
+            return
+
+        records = []
+        for change in changes:
+            if change.kind == ChangeKind.UPDATE:
+                records.append(change.data)
+            elif change.kind == ChangeKind.ADD:
+                records.extend(
+                    {"op": "add", "row": row} for row in _journal_rows(change.data)
+                )
+            else:
+                records.append({"op": "delete", "word": change.data})
+        self.journal.append_many(records)
+        if self.journal.needs_compaction:
+            self.compact(vocabulary)
+
+    def compact(self, vocabulary: pd.DataFrame):
+        """Fold the practice journal into the snapshot"""
+        self.journal.rotate()
+        with atomic_path(self.snapshot_file) as tmp_path:
+            self._write_snapshot_file(tmp_path, vocabulary)
+        self.journal.discard_rotated()
+
+
+class CsvVocabularyStorage(SnapshotVocabularyStorage):
+    """Vocabulary stored as a CSV snapshot plus a practice journal"""
+
+    def __init__(self, data_dir: Path):
+        super().__init__(data_dir / "vocabulary.csv", data_dir / "vocabulary.journal")
+
+    def load(self) -> pd.DataFrame:
+        vocabulary = super().load()
+
+        # Rewrite files from before options were split so the parse runs once
+        if self._legacy_options:
+            self.save(vocabulary)
+        return vocabulary
+
+    def load_details(self, words: List[str]) -> pd.DataFrame:
+        # The controller keeps CSV details in memory and never calls this.
+        # It still scans the snapshot, but reads only the word and detail
+        # columns as text and replays only the journaled words asked for
+        if not self.exists():
+            return _empty_details()
+        wanted = set(words)
+        columns = set(["word", "options"] + STORED_DETAIL_COLUMNS)
+        details = pd.read_csv(
+            self.snapshot_file, usecols=lambda column: column in columns, dtype=str
+        )
+        details = _join_options(
+            details[details["word"].isin(wanted)].reset_index(drop=True)
+        )
+        records = [
+            record
+            for record in self.journal.read()
+            if (record.get("op") == "add" and record["row"]["word"] in wanted)
+            or (record.get("op") == "delete" and record["word"] in wanted)
+        ]
+        details = _apply_journal(details, records)
+        return (
+            details.drop_duplicates(subset="word", keep="last")
+            .set_index("word")
+            .reindex(columns=DETAIL_COLUMNS)
+        )
+
+    def _read_snapshot(self) -> pd.DataFrame:
+        # Declaring the text columns keeps pandas from guessing per chunk: a
+        # timestamp column that is empty in early rows would otherwise come
+        # back with mixed types and a DtypeWarning
+        vocabulary = pd.read_csv(self.snapshot_file, dtype=CSV_TEXT_DTYPES)
+        self._legacy_options = "options" in vocabulary.columns
+        return _parse_timestamps(_join_options(vocabulary))
+
+    def _write_snapshot_file(self, path: Path, vocabulary: pd.DataFrame):
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for i, chunk in enumerate(_chunks(vocabulary)):
+                _serialize_for_storage(chunk).to_csv(f, index=False, header=i == 0)
+
+
+class ArrowVocabularyStorage(SnapshotVocabularyStorage):
+    """Vocabulary stored as Arrow IPC snapshots plus a practice journal.
+
+    The snapshots keep the column dtypes and are memory-mapped on load, so
+    nothing has to be parsed from text or converted afterwards. The long
+    text columns live in a separate details snapshot, from which only the
+    rows a view is about to show are read. Details of words added or
+    deleted since the last compaction are served from the journal's
+    records and folded into the details snapshot by compaction.
+    """
+
+    lazy_details = True
+
+    def __init__(self, data_dir: Path):
+        if pa is None:
+            raise ImportError(
+                "The arrow storage backend requires pyarrow: pip install 'polyglot[arrow]'"
+            )
+        super().__init__(
+            data_dir / "vocabulary.arrow", data_dir / "vocabulary.arrow.journal"
+        )
+        self.details_file = data_dir / "vocabulary.details.arrow"
+        # Details are read by the UI thread while the worker may be rewriting them
+        self._details_lock = threading.Lock()
+        # Journaled details by word, None for deleted words
+        self._detail_delta: Dict[str, Optional[Dict]] = {}
+
+    def load(self) -> pd.DataFrame:
+        records = self.journal.read()
+        vocabulary = _apply_journal(self._read_snapshot(), records)
+        with self._details_lock:
+            self._detail_delta = {}
+            for record in records:
+                if record.get("op") == "add":
+                    self._detail_delta[record["row"]["word"]] = _detail_row(
+                        record["row"]
+                    )
+                elif record.get("op") == "delete":
+                    self._detail_delta[record["word"]] = None
+
+        # Snapshots from before the details were split hold every column
+        if self._legacy_layout:
+            self.save(vocabulary)
+            vocabulary = vocabulary.drop(columns=DETAIL_COLUMNS)
+        return vocabulary
+
+    def load_details(self, words: List[str]) -> pd.DataFrame:
+        with self._details_lock:
+            journaled = [word for word in words if word in self._detail_delta]
+            rows = [
+                self._detail_delta[word]
+                for word in journaled
+                if self._detail_delta[word] is not None
+            ]
+            stored = [word for word in words if word not in self._detail_delta]
+            if stored and self.details_file.exists():
+                with pa.memory_map(str(self.details_file), "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+                    # Only the selected rows are copied out of the mapped file
+                    mask = pc.is_in(
+                        table["word"], value_set=pa.array(stored, pa.string())
+                    )
+                    table = table.filter(mask)
+            else:
+                table = _details_schema().empty_table()
+        if rows:
+            table = pa.concat_tables(
+                [table, pa.Table.from_pylist(rows, schema=_details_schema())]
+            )
+        if table.num_rows == 0:
+            return _empty_details()
+        return (
+            _join_options(table.to_pandas())
+            .drop_duplicates(subset="word", keep="last")
+            .set_index("word")
+        )
+
+    def save(self, vocabulary: pd.DataFrame):
+        if all(column in vocabulary.columns for column in DETAIL_COLUMNS):
+            with self._details_lock:
+                self._write_details(self._details_table(vocabulary))
+                self._detail_delta = {}
+        else:
+            # The journal is cleared, so its details have to be in the snapshot
+            self._fold_detail_delta()
+        super().save(vocabulary)
+
+    def write_changes(
+        self, vocabulary: Optional[pd.DataFrame], changes: List[VocabularyChange]
+    ):
+        # Details only change when words are added or deleted; they are
+        # journaled with the added rows and kept in memory until compaction
+        with self._details_lock:
+            for change in changes:
+                if change.kind == ChangeKind.ADD:
+                    for row in _journal_rows(change.data):
+                        self._detail_delta[row["word"]] = _detail_row(row)
+                elif change.kind == ChangeKind.DELETE:
+                    self._detail_delta[change.data] = None
+        super().write_changes(vocabulary, changes)
+
+    def compact(self, vocabulary: pd.DataFrame):
+        # Replaying the journal again after a crash re-applies the same details
+        self._fold_detail_delta()
+        super().compact(vocabulary)
+
+    def _read_snapshot(self) -> pd.DataFrame:
+        with pa.memory_map(str(self.snapshot_file), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        self._legacy_layout = OPTION_COLUMNS[0] in table.column_names
+        return _join_options(table.to_pandas())
+
+    def _write_snapshot_file(self, path: Path, vocabulary: pd.DataFrame):
+        vocabulary = vocabulary.reindex(columns=SUMMARY_COLUMNS)
+        for col in TIMESTAMP_COLUMNS:
+            vocabulary[col] = pd.to_datetime(vocabulary[col], errors="coerce")
+        for col in ("times_practiced", "correct_answers"):
+            vocabulary[col] = vocabulary[col].fillna(0)
+        # Missing flags count as not viewed
+        vocabulary["viewed"] = vocabulary["viewed"].eq(True)
+        # Categories become dictionary arrays and come back as categoricals
+        vocabulary = apply_vocabulary_dtypes(vocabulary)
+        _write_arrow_file(path, pa.Table.from_pandas(vocabulary, preserve_index=False))
+
+    def _details_table(self, vocabulary: pd.DataFrame) -> "pa.Table":
+        """Convert the detail columns of a vocabulary into an Arrow table"""
+        details = _serialize_for_storage(vocabulary[["word"] + DETAIL_COLUMNS])
+        return pa.Table.from_pandas(
+            details, schema=_details_schema(), preserve_index=False
+        )
+
+    def _fold_detail_delta(self):
+        """Apply the journaled details to the details snapshot"""
+        with self._details_lock:
+            if not self._detail_delta:
+                return
+            if self.details_file.exists():
+                with pa.memory_map(str(self.details_file), "r") as source:
+                    details = pa.ipc.open_file(source).read_all()
+            else:
+                details = _details_schema().empty_table()
+
+            words = pa.array(list(self._detail_delta), pa.string())
+            rows = [row for row in self._detail_delta.values() if row is not None]
+            details = pa.concat_tables(
+                [
+                    _drop_words(details, words),
+                    pa.Table.from_pylist(rows, schema=_details_schema()),
+                ]
+            )
+            self._write_details(details)
+            self._detail_delta = {}
+
+    def _write_details(self, details: "pa.Table"):
+        """Replace the details snapshot; call with the details lock held"""
+        with atomic_path(self.details_file) as tmp_path:
+            _write_arrow_file(tmp_path, details)
+
+
+def _details_schema() -> "pa.Schema":
+    """Schema of the Arrow details snapshot: the stored detail columns as text"""
+    return pa.schema(
+        [(column, pa.string()) for column in ["word"] + STORED_DETAIL_COLUMNS]
+    )
+
+
+def _detail_row(row: Dict) -> Dict:
+    """Pick the stored detail columns out of a journaled row"""
+    return {column: row.get(column) for column in ["word"] + STORED_DETAIL_COLUMNS}
+
+
+def _write_arrow_file(path: Path, table: "pa.Table"):
+    """Write a table as an uncompressed IPC file, so it can be memory-mapped as is"""
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _drop_words(table: "pa.Table", words: "pa.Array") -> "pa.Table":
+    """Remove the rows of the given words from an Arrow table"""
+    return table.filter(pc.invert(pc.is_in(table["word"], value_set=words)))
+
+
+def _apply_journal(vocabulary: pd.DataFrame, records: List[Dict]) -> pd.DataFrame:
+    """Replay journaled changes on top of a freshly loaded snapshot"""
+    if not records:
+        return vocabulary
+
+    # Fold the records in order; adding or deleting a word discards its earlier stats
+    added: Dict[str, Dict] = {}
+    removed = set()
+    stats: Dict[str, Dict] = {}
+    for record in records:
+        op = record.get("op")
+        if op == "add":
+            word = record["row"]["word"]
+            added[word] = record["row"]
+        elif op == "delete":
+            word = record["word"]
+            added.pop(word, None)
+        else:
+            # Stat records hold absolute values, so the latest one wins
+            stats.setdefault(record["word"], {}).update(record)
+            continue
+        removed.add(word)
+        stats.pop(word, None)
+
+    if removed:
+        vocabulary = vocabulary[~vocabulary["word"].isin(removed)].reset_index(
+            drop=True
+        )
+    if added:
+        rows = _parse_timestamps(_join_options(pd.DataFrame(list(added.values()))))
+        rows = rows.reindex(columns=vocabulary.columns)
+        vocabulary = (
+            pd.concat([vocabulary, rows], ignore_index=True)
+            if not vocabulary.empty
+            else rows
+        )
+    if not stats or vocabulary.empty:
+        return vocabulary
+
+    updates = pd.DataFrame(list(stats.values())).set_index("word")
+    for col in TIMESTAMP_COLUMNS:
+        if col in updates.columns:
+            updates[col] = pd.to_datetime(updates[col], errors="coerce")
+            if col in vocabulary.columns:
+                vocabulary[col] = pd.to_datetime(vocabulary[col], errors="coerce")
+    mask = vocabulary["word"].isin(updates.index)
+    if not mask.any():
+        return vocabulary
+
+    rows = updates.loc[vocabulary.loc[mask, "word"]]
+    for col in updates.columns:
+        if col not in vocabulary.columns:
+            vocabulary[col] = None
+        # Match the column dtype so int32 counters are not upcast
+        vocabulary.loc[mask, col] = rows[col].astype(vocabulary[col].dtype).values
+    return vocabulary
+
+
+class SqliteVocabularyStorage(VocabularyStorage):
+    """Vocabulary stored in SQLite tables with one row per word.
+
+    Stat updates, inserts and deletes are single statements against the
+    indexed table, so their cost does not grow with the vocabulary size.
+    The long text columns live in a separate table that is only queried
+    for the words a view is about to show.
+    """
+
+    lazy_details = True
+
+    def __init__(self, data_dir: Path):
+        self.db_file = data_dir / "vocabulary.sqlite"
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self.connection:
+            self.connection.execute(
+                """CREATE TABLE IF NOT EXISTS vocabulary (
+                    word TEXT PRIMARY KEY,
+                    translation TEXT,
+                    times_practiced INTEGER NOT NULL DEFAULT 0,
+                    correct_answers INTEGER NOT NULL DEFAULT 0,
+                    topic TEXT,
+                    level TEXT,
+                    correct_answer TEXT,
+                    viewed INTEGER NOT NULL DEFAULT 0,
+                    last_practiced TEXT,
+                    interval REAL NOT NULL DEFAULT 0,
+                    ease REAL NOT NULL DEFAULT 2.5,
+                    due TEXT
+                )"""
+            )
+            self.connection.execute(
+                """CREATE TABLE IF NOT EXISTS vocabulary_details (
+                    word TEXT PRIMARY KEY,
+                    example TEXT,
+                    example_translation TEXT,
+                    sentence_to_fill TEXT,
+                    sentence_to_fill_translation TEXT,
+                    option_1 TEXT,
+                    option_2 TEXT,
+                    option_3 TEXT,
+                    option_4 TEXT
+                )"""
+            )
+
+            # Databases created before options were split have an options column
+            columns = [
+                row[1]
+                for row in self.connection.execute("PRAGMA table_info(vocabulary)")
+            ]
+            if "options" in columns:
+                self._migrate_options_column(columns)
+            # ...and before the details were split, all columns in one table
+            if "example" in columns:
+                self._migrate_detail_columns()
+            # ...and before words were scheduled, no review schedule
+            for column, definition in (
+                ("interval", "REAL NOT NULL DEFAULT 0"),
+                ("ease", "REAL NOT NULL DEFAULT 2.5"),
+                ("due", "TEXT"),
+            ):
+                if column not in columns:
+                    self.connection.execute(
+                        f"ALTER TABLE vocabulary ADD COLUMN {column} {definition}"
+                    )
+
+            # Sessions are selected from the in-memory vocabulary, never with
+            # SQL, so the only indexes are the word primary keys: stat updates,
+            # deletes and load_details() look words up by them. Indexes on the
+            # stat columns, created by earlier versions, only slowed down
+            # every stat update
+            for column in ("viewed", "times_practiced", "last_practiced", "due"):
+                self.connection.execute(f"DROP INDEX IF EXISTS idx_vocabulary_{column}")
+
+    def _migrate_options_column(self, columns: List[str]):
+        """Move the list repr in the options column into the option columns"""
+        for column in OPTION_COLUMNS:
+            if column not in columns:
+                self.connection.execute(
+                    f"ALTER TABLE vocabulary ADD COLUMN {column} TEXT"
+                )
+        rows = self.connection.execute(
+            "SELECT word, options FROM vocabulary WHERE options IS NOT NULL"
+        ).fetchall()
+        self.connection.executemany(
+            "UPDATE vocabulary SET option_1 = ?, option_2 = ?, option_3 = ?, "
+            "option_4 = ? WHERE word = ?",
+            [(*ast.literal_eval(options), word) for word, options in rows],
+        )
+        self.connection.execute("ALTER TABLE vocabulary DROP COLUMN options")
+
+    def _migrate_detail_columns(self):
+        """Move the long text columns into the details table"""
+        columns = ", ".join(["word"] + STORED_DETAIL_COLUMNS)
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO vocabulary_details ({columns}) "
+            f"SELECT {columns} FROM vocabulary"
+        )
+        for column in STORED_DETAIL_COLUMNS:
+            self.connection.execute(f"ALTER TABLE vocabulary DROP COLUMN {column}")
+
+    def exists(self) -> bool:
+        # The file is created on connect, so an interrupted import would leave
+        # an empty database behind; only a stamped version or rows count
+        with self._lock:
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            has_rows = self.connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM vocabulary)"
+            ).fetchone()[0]
+        return version > 0 or bool(has_rows)
+
+    def read_schema_version(self) -> int:
+        with self._lock:
+            return self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+    def write_schema_version(self, version: int):
+        with self._lock, self.connection:
+            self.connection.execute(f"PRAGMA user_version = {int(version)}")
+
+    def load(self) -> pd.DataFrame:
+        with self._lock:
+            vocabulary = pd.read_sql_query(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM vocabulary ORDER BY rowid",
+                self.connection,
+            )
+        return _parse_timestamps(vocabulary)
+
+    def load_details(self, words: List[str]) -> pd.DataFrame:
+        columns = ", ".join(["word"] + STORED_DETAIL_COLUMNS)
+        chunks = []
+        with self._lock:
+            # Stay below SQLite's limit on the number of query parameters
+            for start in range(0, len(words), 500):
+                chunk = words[start : start + 500]
+                chunks.append(
+                    pd.read_sql_query(
+                        f"SELECT {columns} FROM vocabulary_details "
+                        f"WHERE word IN ({', '.join('?' for _ in chunk)})",
+                        self.connection,
+                        params=chunk,
+                    )
+                )
+        if not chunks:
+            return _empty_details()
+        return _join_options(pd.concat(chunks, ignore_index=True)).set_index("word")
+
+    def save(self, vocabulary: pd.DataFrame):
+        """Replace the whole table with the given vocabulary"""
+        with self._lock, self.connection:
+            self._replace_all(vocabulary)
+
+    def import_csv(self, csv_storage: "CsvVocabularyStorage"):
+        """Import the CSV vocabulary and its version in one transaction"""
+        vocabulary = csv_storage.load()
+        version = csv_storage.read_schema_version()
+        with self._lock, self.connection:
+            self._replace_all(vocabulary)
+            self.connection.execute(f"PRAGMA user_version = {int(version)}")
+
+    def write_changes(
+        self, vocabulary: Optional[pd.DataFrame], changes: List[VocabularyChange]
+    ):
+        """Apply all queued changes in order, in a single transaction"""
+        with self._lock, self.connection:
+            for change in changes:
+                if change.kind == ChangeKind.UPDATE:
+                    self._update(change.data)
+                elif change.kind == ChangeKind.ADD:
+                    self._insert(change.data)
+                elif change.kind == ChangeKind.DELETE:
+                    for table in ("vocabulary", "vocabulary_details"):
+                        self.connection.execute(
+                            f"DELETE FROM {table} WHERE word = ?", (change.data,)
+                        )
+                else:
+                    self._replace_all(vocabulary)
+
+    def _replace_all(self, vocabulary: pd.DataFrame):
+        self.connection.execute("DELETE FROM vocabulary")
+        self._insert(vocabulary)
+        # Details are kept unless the vocabulary brought its own
+        self.connection.execute(
+            "DELETE FROM vocabulary_details "
+            "WHERE word NOT IN (SELECT word FROM vocabulary)"
+        )
+
+    def _update(self, record: Dict):
+        columns = [col for col in record if col != "word"]
+        assignments = ", ".join(f"{col} = ?" for col in columns)
+        self.connection.execute(
+            f"UPDATE vocabulary SET {assignments} WHERE word = ?",
+            [record[col] for col in columns] + [record["word"]],
+        )
+
+    def _insert(self, rows: pd.DataFrame):
+        has_details = all(column in rows.columns for column in DETAIL_COLUMNS)
+        for chunk in _chunks(rows):
+            summary = _serialize_for_storage(chunk.reindex(columns=SUMMARY_COLUMNS))
+            # Missing flags count as not viewed
+            summary["viewed"] = summary["viewed"].eq(True).astype(int)
+            for col in ("times_practiced", "correct_answers"):
+                summary[col] = summary[col].fillna(0).astype(int)
+            self._insert_rows("vocabulary", summary)
+
+            if has_details:
+                details = _serialize_for_storage(chunk[["word"] + DETAIL_COLUMNS])
+                self._insert_rows("vocabulary_details", details)
+
+    def _insert_rows(self, table: str, rows: pd.DataFrame):
+        rows = rows.astype(object).where(rows.notna(), None)
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO {table} ({', '.join(rows.columns)}) "
+            f"VALUES ({', '.join('?' for _ in rows.columns)})",
+            rows.itertuples(index=False, name=None),
+        )
+
+
+def create_vocabulary_storage(backend: str, data_dir: Path) -> VocabularyStorage:
+    """Create the configured storage, importing the CSV vocabulary on its first use"""
+    data_dir.mkdir(exist_ok=True)
+    backend = StorageBackends(backend)
+    if backend == StorageBackends.CSV:
+        return CsvVocabularyStorage(data_dir)
+
+    if backend == StorageBackends.SQLITE:
+        storage = SqliteVocabularyStorage(data_dir)
+    else:
+        storage = ArrowVocabularyStorage(data_dir)
+
+    csv_storage = CsvVocabularyStorage(data_dir)
+    if not storage.exists() and csv_storage.exists():
+        storage.import_csv(csv_storage)
+    return storage
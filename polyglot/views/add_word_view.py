@@ -123,6 +123,14 @@ class AddWordView(BaseView):
             self.status_label.configure(text="Please enter a word first")
             return
 
+        # Don't spend a generation on a word that is already known
+        duplicate = self.vocab_controller.find_duplicate(word)
+        if duplicate is not None:
+            self.status_label.configure(
+                text=f"'{duplicate}' is already in your vocabulary", text_color="red"
+            )
+            return
+
         try:
             # Disable generate button and show progress
             self.generate_btn.configure(state="disabled")
@@ -137,7 +145,7 @@ class AddWordView(BaseView):
             self.progress_bar.pack(pady=(0, 10), padx=20)
             self.progress_bar.start()
 
-            # Schedule the generation to avoid freezing UI
+            # Start the generation once the progress bar is shown
             self.after(100, self._do_generate_word_details)
 
         except Exception as e:
@@ -146,32 +154,24 @@ class AddWordView(BaseView):
 
     def _do_generate_word_details(self):
         """Actually perform the word generation"""
-        try:
-            word = self.word_entry.get().strip()
-
-            # Generate a single word with all details
-            words = self.vocab_controller.generate_words(
-                native_lang=self.vocab_controller.user_controller.settings[
-                    "native_language"
-                ],
-                target_lang=self.vocab_controller.user_controller.settings[
-                    "target_language"
-                ],
-                level=self.vocab_controller.user_controller.settings["level"],
-                topics=["custom"],
-                include_phrases=False,
-                exclude_words=[],
-                custom_word=word,
-            )
-
-            if not words:
-                self.status_label.configure(
-                    text="Failed to generate word details", text_color="red"
-                )
-                return
+        word = self.word_entry.get().strip()
+        settings = self.vocab_controller.user_controller.settings
+
+        # Generate on the asyncio loop so the progress bar keeps moving
+        self.run_async(
+            self.vocab_controller.generate_word_details_async(
+                word,
+                native_lang=settings["native_language"],
+                target_lang=settings["target_language"],
+                level=settings["level"],
+            ),
+            on_done=self._show_generated_word,
+            on_error=self._show_generation_error,
+        )
 
-            # Fill in the details
-            generated = words[0]
+    def _show_generated_word(self, generated):
+        """Fill in the form with the generated word details"""
+        try:
             self.translation_entry.configure(state="normal")
             self.translation_entry.delete(0, "end")
             self.translation_entry.insert(0, generated["translation"])
@@ -197,19 +197,36 @@ class AddWordView(BaseView):
 
             # Enable add button
             self.add_btn.configure(state="normal")
-            self.status_label.configure(
-                text="Word details generated successfully!", text_color="green"
-            )
+            similar = self.vocab_controller.get_near_duplicates(generated["word"])
+            if similar:
+                # Warn about likely duplicates but still allow adding the word
+                self.status_label.configure(
+                    text="Word details generated. Similar words already in your"
+                    f" vocabulary: {', '.join(similar)}",
+                    text_color="orange",
+                )
+            else:
+                self.status_label.configure(
+                    text="Word details generated successfully!", text_color="green"
+                )
 
         except Exception as e:
             self.status_label.configure(text=f"Error: {str(e)}", text_color="red")
         finally:
-            # Re-enable generate button and remove progress bar
-            self.generate_btn.configure(state="normal")
-            if hasattr(self, "progress_bar"):
-                self.progress_bar.stop()
-                self.progress_bar.pack_forget()
-                del self.progress_bar
+            self._finish_generation()
+
+    def _show_generation_error(self, error: Exception):
+        """Show why the word details could not be generated"""
+        self.status_label.configure(text=f"Error: {str(error)}", text_color="red")
+        self._finish_generation()
+
+    def _finish_generation(self):
+        """Re-enable the generate button and remove the progress bar"""
+        self.generate_btn.configure(state="normal")
+        if hasattr(self, "progress_bar"):
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            del self.progress_bar
 
     def add_word(self):
         """Add the word to vocabulary"""
@@ -1,5 +1,5 @@
 import customtkinter as ctk
-from typing import Callable, Optional
+from typing import Any, Callable, Coroutine, Optional
 
 
 class BaseView(ctk.CTkFrame):
@@ -17,6 +17,15 @@ class BaseView(ctk.CTkFrame):
         # Place in top-right corner
         self.back_to_menu_button.place(relx=0.95, rely=0.05, anchor="e")
 
+    def run_async(
+        self,
+        coroutine: Coroutine,
+        on_done: Callable[[Any], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        """Run a coroutine on the app's asyncio loop and pass its result to on_done on the Tk thread."""
+        self.winfo_toplevel().async_loop.submit(coroutine, on_done, on_error)
+
     def remove_back_to_menu_button(self):
         """Remove the back to menu button if it exists."""
         if self.back_to_menu_button:
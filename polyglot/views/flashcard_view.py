@@ -2,6 +2,7 @@ import customtkinter as ctk
 from typing import Callable
 import pandas as pd
 from polyglot.controllers.vocabulary_controller import VocabularyController
+from polyglot.services.session_planner import SessionKinds
 from polyglot.views.base_view import BaseView
 
 
@@ -90,9 +91,7 @@ class FlashcardView(BaseView):
 
     def load_words(self):
         """Load words for today's learning session"""
-        self.words = self.vocab_controller.get_flashcard_words(
-            count=self.vocab_controller.user_controller.words_per_day
-        )
+        self.words = self.vocab_controller.get_session_words(SessionKinds.FLASHCARDS)
         if not self.words.empty:
             self.show_word(0)
         else:
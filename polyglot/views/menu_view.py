@@ -173,17 +173,9 @@ class MenuView(BaseView):
 
     def update_word_count(self):
         """Update the word count display"""
-        vocab_df = self.vocab_controller.vocabulary
-        total_words = len(vocab_df)
-
-        # Count words that have been practiced at least 7 times with 75% success rate
-        learned_words = len(
-            vocab_df[
-                (vocab_df["times_practiced"] >= 7)
-                & (vocab_df["correct_answers"] / vocab_df["times_practiced"] >= 0.75)
-            ]
-        )
+        # Counts are kept up to date by the controller, using the learnt thresholds from the settings
+        summary = self.vocab_controller.get_progress_summary()
 
         self.word_count_label.configure(
-            text=f"Total Words: {total_words} | Words Learnt: {learned_words}"
+            text=f"Total Words: {summary['total_words']} | Words Learnt: {summary['words_learnt']}"
         )
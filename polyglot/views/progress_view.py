@@ -3,7 +3,6 @@ from typing import Callable
 import pandas as pd
 from polyglot.controllers.vocabulary_controller import VocabularyController
 from polyglot.views.base_view import BaseView
-from datetime import datetime
 
 
 class ProgressView(BaseView):
@@ -100,49 +99,12 @@ class ProgressView(BaseView):
             for widget in self.vocab_frame.winfo_children():
                 widget.destroy()
 
-            # Ensure required columns exist
-            required_columns = ["times_practiced", "correct_answers", "last_practiced"]
-            for col in required_columns:
-                if col not in progress_data.columns:
-                    if col == "times_practiced" or col == "correct_answers":
-                        progress_data[col] = 0
-                    elif col == "last_practiced":
-                        progress_data[col] = datetime.now()
-
-            # Calculate statistics
-            total_words = len(progress_data)
-
-            # Get learning thresholds from settings
-            min_practice = self.vocab_controller.user_controller.min_practice_count
-            min_success = (
-                self.vocab_controller.user_controller.min_success_rate / 100
-            )  # Convert to decimal
-
-            # Words learnt (practiced >= min_practice times with >= min_success rate)
-            words_learnt = len(
-                progress_data[
-                    (progress_data["times_practiced"] >= min_practice)
-                    & (progress_data["success_rate"] >= min_success * 100)
-                ]
-            )
-
-            # Words in progress (practiced but not yet learnt)
-            words_in_progress = len(
-                progress_data[
-                    (progress_data["times_practiced"] > 0)
-                    & ~(
-                        (progress_data["times_practiced"] >= min_practice)
-                        & (progress_data["success_rate"] >= min_success * 100)
-                    )
-                ]
-            )
-
-            # Average success rate for practiced words
-            practiced_words = progress_data[progress_data["times_practiced"] > 0]
-            if len(practiced_words) > 0:
-                avg_success_rate = practiced_words["success_rate"].mean()
-            else:
-                avg_success_rate = 0
+            # Statistics are kept up to date by the controller
+            summary = self.vocab_controller.get_progress_summary()
+            total_words = summary["total_words"]
+            words_learnt = summary["words_learnt"]
+            words_in_progress = summary["words_in_progress"]
+            avg_success_rate = summary["average_success_rate"]
 
             # Update statistics display
             self.total_words_label.configure(text=f"Total words: {total_words}")
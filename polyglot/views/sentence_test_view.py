@@ -2,6 +2,7 @@ import random
 import customtkinter as ctk
 from typing import Callable
 from polyglot.controllers.vocabulary_controller import VocabularyController
+from polyglot.services.session_planner import SessionKinds
 from polyglot.views.base_view import BaseView
 
 
@@ -98,8 +99,8 @@ class SentenceTestView(BaseView):
 
     def load_test_words(self):
         """Load words for the sentence test session"""
-        self.test_words = self.vocab_controller.get_test_words(
-            count=self.vocab_controller.user_controller.test_word_count
+        self.test_words = self.vocab_controller.get_session_words(
+            SessionKinds.SENTENCE_TEST
         )
         if not self.test_words.empty:
             self.show_question(0)
@@ -1,9 +1,11 @@
 import customtkinter as ctk
 from typing import Callable
 import pandas as pd
-import threading
-from polyglot.controllers.vocabulary_controller import VocabularyController
-from datetime import datetime
+from polyglot.controllers.vocabulary_controller import (
+    TranslationGradingModes,
+    VocabularyController,
+)
+from polyglot.services.session_planner import SessionKinds
 from polyglot.views.base_view import BaseView
 
 
@@ -26,6 +28,12 @@ class SentenceTranslationView(BaseView):
         self.answer_checked = False
         self.is_checking = False  # Flag to track if we are in the middle of a check
         self.user_settings = self.vocab_controller.user_controller.get_settings()
+        # In "grade all at the end" mode, the (word, translation) pairs to check
+        self.grade_at_end = (
+            self.user_settings.get("translation_grading")
+            == TranslationGradingModes.AT_END.value
+        )
+        self.pending_translations = []
 
         self.setup_ui()
         self.load_practice_sentences()
@@ -75,7 +83,9 @@ class SentenceTranslationView(BaseView):
 
         # Check button
         self.check_button = ctk.CTkButton(
-            self.button_frame, text="Check Translation", command=self.check_answer
+            self.button_frame,
+            text="Save Translation" if self.grade_at_end else "Check Translation",
+            command=self.check_answer,
         )
         self.check_button.pack(side="left", padx=10)
 
@@ -112,11 +122,18 @@ class SentenceTranslationView(BaseView):
         self.loading_label.pack_forget()  # Hide initially
 
         # Instructions
+        if self.grade_at_end:
+            instructions = (
+                "Translate the sentence from your native language to your target language.\n"
+                "Press Enter to save your answer; all translations are checked at the end."
+            )
+        else:
+            instructions = (
+                "Translate the sentence from your native language to your target language.\n"
+                "Press Enter to check your answer or click the Check Translation button."
+            )
         self.instructions_label = ctk.CTkLabel(
-            self,
-            text="Translate the sentence from your native language to your target language.\n"
-            "Press Enter to check your answer or click the Check Translation button.",
-            font=("Helvetica", 12),
+            self, text=instructions, font=("Helvetica", 12)
         )
         self.instructions_label.pack(pady=10)
 
@@ -126,7 +143,9 @@ class SentenceTranslationView(BaseView):
 
     def load_practice_sentences(self):
         """Load sentences for translation practice"""
-        self.test_words = self.vocab_controller.get_translation_practice_sentences(5)
+        self.test_words = self.vocab_controller.get_session_words(
+            SessionKinds.TRANSLATION
+        )
 
         if len(self.test_words) > 0:
             self.show_question(0)
@@ -183,13 +202,19 @@ class SentenceTranslationView(BaseView):
                 )
                 return
 
+            if self.grade_at_end:
+                # Checked with the rest of the session in one request
+                self.pending_translations.append((word, user_translation))
+                self.next_question()
+                return
+
             # Show loading indicator
             self.loading_label.pack(pady=10)
             self.check_button.configure(state="disabled")
             self.dont_know_button.configure(state="disabled")
             self.is_checking = True
 
-            # Run check in a separate thread to keep UI responsive
+            # Run the check on the asyncio loop to keep the UI responsive
             settings = self.vocab_controller.user_controller.get_settings()
             native_lang = settings["native_language"]
             target_lang = settings["target_language"]
@@ -197,24 +222,43 @@ class SentenceTranslationView(BaseView):
             # Get the original sentence from the vocabulary
             original_sentence = word["example_translation"]  # In native language
 
-            def check_translation_thread():
-                try:
-                    # Call the LLM to check the translation
-                    result = self.vocab_controller.check_sentence_translation(
-                        original_sentence=original_sentence,
-                        translation=user_translation,
-                        native_lang=native_lang,
-                        target_lang=target_lang,
-                    )
-
-                    # Update the UI with the result (must be done in the main thread)
-                    self.after(0, lambda: self.display_check_result(result, word))
-                except Exception as e:
-                    # Handle any errors
-                    self.after(0, lambda: self.display_error(str(e)))
-
-            # Start the check in a separate thread
-            threading.Thread(target=check_translation_thread, daemon=True).start()
+            # Results arrive on the Tk thread, so they can update the UI directly
+            self.run_async(
+                self.stream_check_result(
+                    original_sentence, user_translation, native_lang, target_lang
+                ),
+                on_done=lambda result: self.display_check_result(result, word),
+                on_error=lambda e: self.display_error(str(e)),
+            )
+
+    async def stream_check_result(
+        self,
+        original_sentence: str,
+        translation: str,
+        native_lang: str,
+        target_lang: str,
+    ):
+        """Show the verdict as soon as it arrives and the comment as it is written"""
+        result = None
+        async for result in self.vocab_controller.stream_sentence_translation_check(
+            original_sentence=original_sentence,
+            translation=translation,
+            native_lang=native_lang,
+            target_lang=target_lang,
+        ):
+            if result["is_correct"] is not None:
+                self.loading_label.pack_forget()
+                self.feedback_label.configure(**self.feedback_text(result))
+        return result
+
+    def feedback_text(self, result, word=None):
+        """Get the feedback label text and color for a check, with the reference if given"""
+        if result["is_correct"]:
+            return {"text": f"✓ Correct!\n\n{result['comment']}", "text_color": "green"}
+        text = f"✗ Needs improvement\n\n{result['comment']}"
+        if word is not None:
+            text += f"\n\nReference translation: {word['example']}"
+        return {"text": text, "text_color": "orange"}
 
     def display_check_result(self, result, word):
         """Display the check result from the LLM"""
@@ -224,16 +268,9 @@ class SentenceTranslationView(BaseView):
         # Update word statistics
         self.vocab_controller.update_word_stats(word["word"], result["is_correct"])
 
+        self.feedback_label.configure(**self.feedback_text(result, word))
         if result["is_correct"]:
-            self.feedback_label.configure(
-                text=f"✓ Correct!\n\n{result['comment']}", text_color="green"
-            )
             self.correct_answers += 1
-        else:
-            self.feedback_label.configure(
-                text=f"✗ Needs improvement\n\n{result['comment']}\n\nReference translation: {word['example']}",
-                text_color="orange",
-            )
 
         # Disable buttons and show next
         self.check_button.configure(state="disabled")
@@ -267,9 +304,63 @@ class SentenceTranslationView(BaseView):
         self.current_word_idx += 1
         if self.current_word_idx < len(self.test_words):
             self.show_question(self.current_word_idx)
+        elif self.pending_translations:
+            self.check_pending_translations()
         else:
             self.show_completion()
 
+    def check_pending_translations(self):
+        """Check all the saved translations of the session in a single request"""
+        # Nothing can be answered while the batch is checked
+        self.is_checking = True
+        self.answer_checked = False
+        self.native_sentence_label.configure(text="")
+        self.feedback_label.configure(text="")
+        self.translation_entry.delete("0.0", "end")
+        self.translation_entry.configure(state="disabled")
+        self.check_button.configure(state="disabled")
+        self.dont_know_button.configure(state="disabled")
+        self.next_button.pack_forget()
+        self.loading_label.configure(
+            text=f"Checking your {len(self.pending_translations)} translations..."
+        )
+        self.loading_label.pack(pady=10)
+
+        settings = self.vocab_controller.user_controller.get_settings()
+        self.run_async(
+            self.vocab_controller.check_sentence_translations_async(
+                translations=[
+                    (word["example_translation"], translation)
+                    for word, translation in self.pending_translations
+                ],
+                native_lang=settings["native_language"],
+                target_lang=settings["target_language"],
+            ),
+            on_done=self.display_batch_results,
+            on_error=lambda e: self.display_batch_error(str(e)),
+        )
+
+    def display_batch_results(self, results):
+        """Record the checked translations and show the score with the feedback on each"""
+        for (word, _), result in zip(self.pending_translations, results):
+            self.vocab_controller.update_word_stats(word["word"], result["is_correct"])
+            if result["is_correct"]:
+                self.correct_answers += 1
+        self.show_completion(results)
+
+    def display_batch_error(self, error_message):
+        """Let the user retry checking the saved translations if the request fails"""
+        self.loading_label.pack_forget()
+        self.feedback_label.configure(
+            text=f"Error checking translations: {error_message}\n\nPlease try again.",
+            text_color="red",
+        )
+        self.check_button.configure(
+            text="Check Translations",
+            state="normal",
+            command=self.check_pending_translations,
+        )
+
     def show_no_words_message(self):
         """Show message when no words are available for testing"""
         # Clear question frame
@@ -295,8 +386,8 @@ class SentenceTranslationView(BaseView):
         )
         back_btn.pack(pady=20)
 
-    def show_completion(self):
-        """Show completion message and final score"""
+    def show_completion(self, results=None):
+        """Show completion message and final score, with the feedback of a batched check"""
         # Clear question frame
         for widget in self.question_frame.winfo_children():
             widget.destroy()
@@ -322,8 +413,37 @@ class SentenceTranslationView(BaseView):
         # Update progress label
         self.progress_label.configure(text="")
 
-        # Move to menu view
-        self.after(2000, self.on_complete)
+        if results is None:
+            # Move to menu view
+            self.after(2000, self.on_complete)
+            return
+
+        # Feedback on each translation checked at the end, kept until the user leaves
+        results_frame = ctk.CTkScrollableFrame(self.question_frame, height=300)
+        results_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        for (word, translation), result in zip(self.pending_translations, results):
+            if result["is_correct"]:
+                text = f"✓ {word['example_translation']}\n{translation}\n{result['comment']}"
+                color = "green"
+            else:
+                text = (
+                    f"✗ {word['example_translation']}\n{translation}\n{result['comment']}"
+                    f"\nReference translation: {word['example']}"
+                )
+                color = "orange"
+            ctk.CTkLabel(
+                results_frame,
+                text=text,
+                text_color=color,
+                font=("Helvetica", 14),
+                wraplength=560,
+                justify="left",
+            ).pack(pady=10, anchor="w")
+
+        back_btn = ctk.CTkButton(
+            self.question_frame, text="Return to Menu", command=self.on_complete
+        )
+        back_btn.pack(pady=10)
 
     def show_correct_translation(self):
         """Show the correct translation without calling LLM"""
@@ -333,11 +453,7 @@ class SentenceTranslationView(BaseView):
 
             # Update word's last_practiced timestamp without affecting statistics
             # Note: We don't count this as a wrong answer, we just update the last_practiced timestamp
-            self.vocab_controller.vocabulary.loc[
-                self.vocab_controller.vocabulary["word"] == word["word"],
-                "last_practiced",
-            ] = datetime.now()
-            self.vocab_controller.save_vocabulary()
+            self.vocab_controller.update_last_practiced(word["word"])
 
             # Show correct translation
             self.feedback_label.configure(
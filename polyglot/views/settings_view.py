@@ -1,8 +1,22 @@
 import customtkinter as ctk
 from typing import Callable
 from polyglot.controllers.user_controller import UserController
+from polyglot.controllers.vocabulary_controller import TranslationGradingModes
+from polyglot.services.scheduler import SelectionStrategies
 from polyglot.views.base_view import BaseView
 
+# Labels of the word selection strategies shown in the settings
+SELECTION_STRATEGY_LABELS = {
+    SelectionStrategies.BALANCED.value: "Balanced",
+    SelectionStrategies.SPACED_REPETITION.value: "Spaced repetition",
+}
+
+# Labels of the translation grading modes shown in the settings
+TRANSLATION_GRADING_LABELS = {
+    TranslationGradingModes.EACH.value: "After each sentence",
+    TranslationGradingModes.AT_END.value: "All at the end",
+}
+
 
 class SettingsView(BaseView):
     def __init__(
@@ -114,6 +128,66 @@ class SettingsView(BaseView):
         )
         self.min_success_entry.pack(side="right", padx=10)
 
+        # Word selection strategy setting
+        self.selection_strategy_frame = ctk.CTkFrame(self.settings_frame)
+        self.selection_strategy_frame.pack(pady=10, padx=20, fill="x")
+
+        strategy_label = ctk.CTkLabel(
+            self.selection_strategy_frame,
+            text="Word selection:",
+            font=("Helvetica", 16),
+            tooltip="How words are picked for tests and translation practice",
+        )
+        strategy_label.pack(side="left", padx=10)
+
+        self.selection_strategy_var = ctk.StringVar()
+        self.selection_strategy_menu = ctk.CTkOptionMenu(
+            self.selection_strategy_frame,
+            width=160,
+            values=list(SELECTION_STRATEGY_LABELS.values()),
+            variable=self.selection_strategy_var,
+        )
+        self.selection_strategy_menu.pack(side="right", padx=10)
+
+        # Translation grading setting
+        self.translation_grading_frame = ctk.CTkFrame(self.settings_frame)
+        self.translation_grading_frame.pack(pady=10, padx=20, fill="x")
+
+        grading_label = ctk.CTkLabel(
+            self.translation_grading_frame,
+            text="Check translations:",
+            font=("Helvetica", 16),
+            tooltip="Check each translation right away, or all of a session's in one request at its end",
+        )
+        grading_label.pack(side="left", padx=10)
+
+        self.translation_grading_var = ctk.StringVar()
+        self.translation_grading_menu = ctk.CTkOptionMenu(
+            self.translation_grading_frame,
+            width=160,
+            values=list(TRANSLATION_GRADING_LABELS.values()),
+            variable=self.translation_grading_var,
+        )
+        self.translation_grading_menu.pack(side="right", padx=10)
+
+        # Article stripping setting
+        self.strip_articles_frame = ctk.CTkFrame(self.settings_frame)
+        self.strip_articles_frame.pack(pady=10, padx=20, fill="x")
+
+        articles_label = ctk.CTkLabel(
+            self.strip_articles_frame,
+            text="Ignore leading articles:",
+            font=("Helvetica", 16),
+            tooltip='Count "das Haus" and "Haus" as the same word when rejecting duplicates and checking answers',
+        )
+        articles_label.pack(side="left", padx=10)
+
+        self.strip_articles_var = ctk.StringVar()
+        self.strip_articles_checkbox = ctk.CTkCheckBox(
+            self.strip_articles_frame, text="", variable=self.strip_articles_var
+        )
+        self.strip_articles_checkbox.pack(side="right", padx=10)
+
         # Navigation frame
         self.nav_frame = ctk.CTkFrame(self)
         self.nav_frame.pack(pady=20, fill="x")
@@ -139,6 +213,13 @@ class SettingsView(BaseView):
         self.test_word_count_var.set(str(settings.get("test_word_count", 10)))
         self.min_practice_var.set(str(settings.get("min_practice_count", 7)))
         self.min_success_var.set(str(settings.get("min_success_rate", 75)))
+        self.selection_strategy_var.set(
+            SELECTION_STRATEGY_LABELS[settings.get("selection_strategy", "balanced")]
+        )
+        self.translation_grading_var.set(
+            TRANSLATION_GRADING_LABELS[settings.get("translation_grading", "each")]
+        )
+        self.strip_articles_var.set("1" if settings.get("strip_articles") else "0")
 
     def save_settings(self):
         """Save settings and return to previous view"""
@@ -149,6 +230,16 @@ class SettingsView(BaseView):
             test_word_count = max(5, min(50, int(self.test_word_count_var.get())))
             min_practice_count = max(1, min(20, int(self.min_practice_var.get())))
             min_success_rate = max(1, min(100, int(self.min_success_var.get())))
+            selection_strategy = next(
+                value
+                for value, label in SELECTION_STRATEGY_LABELS.items()
+                if label == self.selection_strategy_var.get()
+            )
+            translation_grading = next(
+                value
+                for value, label in TRANSLATION_GRADING_LABELS.items()
+                if label == self.translation_grading_var.get()
+            )
 
             self.user_controller.update_settings(
                 {
@@ -157,6 +248,9 @@ class SettingsView(BaseView):
                     "test_word_count": test_word_count,
                     "min_practice_count": min_practice_count,
                     "min_success_rate": min_success_rate,
+                    "selection_strategy": selection_strategy,
+                    "translation_grading": translation_grading,
+                    "strip_articles": self.strip_articles_var.get() == "1",
                 }
             )
 
@@ -2,6 +2,7 @@ import customtkinter as ctk
 from typing import Callable, List
 import random
 from polyglot.controllers.vocabulary_controller import VocabularyController
+from polyglot.services.session_planner import SessionKinds
 from polyglot.views.base_view import BaseView
 
 
@@ -83,8 +84,8 @@ class TestView(BaseView):
 
     def load_test_words(self):
         """Load words for the test session"""
-        self.test_words = self.vocab_controller.get_test_words(
-            count=self.vocab_controller.user_controller.test_word_count
+        self.test_words = self.vocab_controller.get_session_words(
+            SessionKinds.WORD_TEST
         )
         if not self.test_words.empty:
             self.show_question(0)
@@ -119,12 +120,8 @@ class TestView(BaseView):
         for widget in self.options_frame.winfo_children():
             widget.destroy()
 
-        # Get three random words as distractors
-        other_words = self.vocab_controller.vocabulary[
-            self.vocab_controller.vocabulary["word"] != current_word["word"]
-        ]["word"].tolist()
-
-        options = random.sample(other_words, min(3, len(other_words)))
+        # Get three words of the same topic and level as distractors
+        options = self.vocab_controller.get_distractors(current_word["word"], 3)
         options.append(current_word["word"])
         random.shuffle(options)
 
@@ -155,8 +152,9 @@ class TestView(BaseView):
         """Check the user's answer"""
         if self.current_question < len(self.test_words):
             word = self.test_words.iloc[self.current_question]
-            user_answer = self.answer_entry.get().strip().lower()
-            correct_answer = word["word"].lower()
+            # Accept the answer in any case, Unicode form or with its article
+            user_answer = self.vocab_controller.normalize_word(self.answer_entry.get())
+            correct_answer = self.vocab_controller.normalize_word(word["word"])
 
             is_correct = user_answer == correct_answer
 
@@ -0,0 +1,181 @@
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pytest
+
+from polyglot.services.vocabulary_storage import apply_vocabulary_dtypes
+
+
+def make_vocabulary(count: int, prefix: str = "word") -> pd.DataFrame:
+    """Build a vocabulary of count words with every stored column filled in"""
+    seen = [i % 3 == 0 for i in range(count)]
+    practiced = pd.Timestamp("2024-05-01 12:00:00")
+    return apply_vocabulary_dtypes(
+        pd.DataFrame(
+            {
+                "word": [f"{prefix}{i}" for i in range(count)],
+                "translation": [f"translation {i}" for i in range(count)],
+                "example": [f"An example with {prefix}{i}." for i in range(count)],
+                "example_translation": "An example.",
+                "times_practiced": [2 if s else 0 for s in seen],
+                "correct_answers": [1 if s else 0 for s in seen],
+                "topic": ["Travel" if i % 2 else "Food" for i in range(count)],
+                "level": "A1",
+                "sentence_to_fill": "Fill in ___.",
+                "sentence_to_fill_translation": "Fill in.",
+                "options": [[f"{prefix}{i}", "b", "c", "d"] for i in range(count)],
+                "correct_answer": [f"{prefix}{i}" for i in range(count)],
+                "viewed": seen,
+                "last_practiced": [practiced if s else pd.NaT for s in seen],
+                "interval": [6.0 if s else 0.0 for s in seen],
+                "ease": 2.5,
+                "due": [
+                    practiced + pd.Timedelta(days=6) if s else pd.NaT for s in seen
+                ],
+            }
+        )
+    )
+
+
+@pytest.fixture
+def vocabulary() -> Callable[..., pd.DataFrame]:
+    """Factory for test vocabularies: vocabulary(count, prefix)"""
+    return make_vocabulary
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """A home directory with an empty ~/.polyglot"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    (tmp_path / ".polyglot").mkdir()
+    return tmp_path / ".polyglot"
+
+
+class FakeOpenAIServer:
+    """Local stand-in for the chat completions endpoint of the OpenAI API.
+
+    Replies are sent in the order they were queued with reply(); the last
+    one is repeated once the others are used up. Completions are streamed
+    as server-sent events when the request asks for a stream.
+    """
+
+    def __init__(self):
+        self.replies: deque = deque()
+        # (monotonic arrival time, JSON body) of each request
+        self.requests: List[Tuple[float, Dict]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}/v1"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def reply(
+        self,
+        status: int = 200,
+        content: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None,
+        delay: float = 0.0,
+    ):
+        """Queue a reply: a completion whose message is content as JSON, or an error"""
+        self.replies.append((status, content, headers or {}, delay))
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_reply(self, body: Dict) -> tuple:
+        with self._lock:
+            self.requests.append((time.monotonic(), body))
+            return self.replies.popleft() if len(self.replies) > 1 else self.replies[0]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status, content, headers, delay = server._next_reply(body)
+                time.sleep(delay)
+                if status != 200:
+                    self._send(status, {"error": {"message": "error"}}, headers)
+                elif body.get("stream"):
+                    self._stream(json.dumps(content))
+                else:
+                    self._send(200, _completion(json.dumps(content)), headers)
+
+            def _send(self, status: int, payload: Dict, headers: Dict[str, str]):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, text: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                deltas = [{"role": "assistant", "content": ""}]
+                deltas += [{"content": text[i : i + 4]} for i in range(0, len(text), 4)]
+                for delta in deltas:
+                    self._event(_chunk([{"index": 0, "delta": delta}]))
+                    time.sleep(0.002)
+                self._event(
+                    _chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+                )
+                self._event({**_chunk([]), "usage": USAGE})
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def _event(self, payload: Dict):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+                self.wfile.flush()
+
+        return Handler
+
+
+USAGE = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+
+
+def _completion(text: str) -> Dict:
+    message = {"role": "assistant", "content": text}
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test",
+        "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+        "usage": USAGE,
+    }
+
+
+def _chunk(choices: List[Dict]) -> Dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "test",
+        "choices": choices,
+    }
+
+
+@pytest.fixture
+def openai_server(monkeypatch):
+    """A FakeOpenAIServer that OpenAI clients created in the test talk to"""
+    server = FakeOpenAIServer()
+    monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+    yield server
+    server.close()
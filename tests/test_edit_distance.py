@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from polyglot.services.edit_distance import BKTree, levenshtein
+
+
+def _reference_levenshtein(a: str, b: str) -> int:
+    """The textbook dynamic programming edit distance"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def _random_words(rng: random.Random, count: int, max_length: int) -> list:
+    # A small alphabet with accents, so words share many characters
+    return [
+        "".join(rng.choices("abcdeéñ", k=rng.randint(0, max_length)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "distance"),
+    [
+        ("", "", 0),
+        ("", "casa", 4),
+        ("casa", "casa", 0),
+        ("casa", "cosa", 1),
+        ("casa", "casas", 1),
+        ("kitten", "sitting", 3),
+        ("der", "den", 1),
+        ("niño", "nino", 1),
+    ],
+)
+def test_levenshtein_known_distances(a, b, distance):
+    assert levenshtein(a, b) == distance
+    assert levenshtein(b, a) == distance
+
+
+def test_levenshtein_matches_the_reference():
+    rng = random.Random(7)
+    # Past 64 characters the bit vectors no longer fit a machine word
+    for max_length in (8, 80):
+        words = _random_words(rng, 200, max_length)
+        for a, b in zip(words, reversed(words)):
+            assert levenshtein(a, b) == _reference_levenshtein(a, b)
+
+
+def test_search_finds_the_same_words_as_a_linear_scan():
+    rng = random.Random(11)
+    words = sorted(set(_random_words(rng, 500, 7)))
+    tree = BKTree()
+    tree.rebuild(words)
+
+    for query in _random_words(rng, 50, 7):
+        for max_distance in (0, 1, 2):
+            expected = sorted(
+                (levenshtein(query, word), word)
+                for word in words
+                if levenshtein(query, word) <= max_distance
+            )
+            assert tree.search(query, max_distance) == expected
+
+
+def test_nearest_leaves_out_the_word_itself():
+    tree = BKTree()
+    tree.rebuild(["casa", "cosa", "casas", "perro", "caso"])
+
+    assert tree.nearest("casa", 2, 1) == ["casas", "caso"]
+    assert tree.nearest("perro", 3, 1) == []
+
+
+def test_removed_words_are_not_found_until_added_again():
+    tree = BKTree()
+    tree.rebuild(["casa", "cosa", "caso"])
+
+    tree.remove("cosa")
+    assert len(tree) == 2
+    assert tree.search("cosa", 0) == []
+    assert tree.search("cosa", 1) == [(1, "casa")]
+
+    tree.add("cosa")
+    assert len(tree) == 3
+    assert tree.search("cosa", 0) == [(0, "cosa")]
+
+
+def test_tree_is_rebuilt_once_tombstones_outnumber_words():
+    words = [f"word{i}" for i in range(10)]
+    tree = BKTree()
+    tree.rebuild(words)
+
+    for word in words[:6]:
+        tree.remove(word)
+
+    assert len(tree) == 4
+    assert tree._tombstones == set()
+    assert [word for _, word in tree.search("word", 2)] == words[6:]
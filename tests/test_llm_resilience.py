@@ -0,0 +1,185 @@
+import asyncio
+import email.utils
+import time
+
+import openai
+import pytest
+from pydantic import BaseModel
+
+from polyglot.services.llm_provider import (
+    AsyncOpenAIProvider,
+    LlmProvider,
+    OpenAIProvider,
+)
+from polyglot.services.llm_resilience import (
+    DeadlineExceededError,
+    RateLimiter,
+    ResilientAsyncLlmProvider,
+    ResilientLlmProvider,
+    RetryPolicy,
+    _retry_after,
+)
+
+MESSAGES = [{"role": "user", "content": "x" * 400}]
+
+
+class Answer(BaseModel):
+    ok: bool
+
+
+class BrokenProvider(LlmProvider):
+    """Provider whose requests always fail with an error that is not retried"""
+
+    def get_chat_completion(self, messages, response_format=None, **kwargs):
+        raise ValueError("bad request")
+
+
+class BrokenAsyncProvider(LlmProvider):
+    async def get_chat_completion(self, messages, response_format=None, **kwargs):
+        raise ValueError("bad request")
+
+    async def stream_chat_completion(self, messages, response_format=None, **kwargs):
+        raise ValueError("bad request")
+        yield
+
+
+class _ResponseError(Exception):
+    def __init__(self, headers):
+        self.response = type("Response", (), {"headers": headers})()
+
+
+@pytest.fixture
+def resilient():
+    """Factory for ResilientLlmProvider over OpenAI clients that are closed afterwards"""
+    providers = []
+
+    def make(limiter=None) -> ResilientLlmProvider:
+        # The client's own retries would hide the errors from the wrapper
+        provider = OpenAIProvider("test-key", "test", max_retries=0)
+        providers.append(provider)
+        return ResilientLlmProvider(
+            provider,
+            limiter or RateLimiter(1000, 1_000_000),
+            RetryPolicy(base_delay=0.01),
+        )
+
+    yield make
+    for provider in providers:
+        provider.client.close()
+
+
+def _is_full(limiter: RateLimiter) -> bool:
+    return limiter.requests._tokens == pytest.approx(
+        limiter.requests.capacity, abs=0.1
+    ) and limiter.tokens._tokens == pytest.approx(limiter.tokens.capacity, abs=1)
+
+
+def test_rate_limited_requests_wait_for_retry_after(openai_server, resilient):
+    openai_server.reply(429, headers={"Retry-After": "0.3"})
+    openai_server.reply(429, headers={"Retry-After": "0.3"})
+    openai_server.reply(content={"ok": True})
+
+    response = resilient().get_chat_completion(MESSAGES, Answer)
+
+    assert response.dict_response.ok
+    times = [arrival for arrival, _ in openai_server.requests]
+    assert len(times) == 3
+    assert all(later - earlier >= 0.3 for earlier, later in zip(times, times[1:]))
+
+
+@pytest.mark.parametrize(
+    ("headers", "seconds"),
+    [
+        ({"retry-after-ms": "250"}, 0.25),
+        ({"retry-after": "2"}, 2.0),
+        ({"retry-after-ms": "soon", "retry-after": "1.5"}, 1.5),
+        ({"retry-after": "tomorrow"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_headers(headers, seconds):
+    assert _retry_after(_ResponseError(headers)) == seconds
+
+
+def test_retry_after_http_date():
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert _retry_after(_ResponseError({"retry-after": date})) == pytest.approx(
+        30, abs=2
+    )
+    assert _retry_after(ValueError()) is None
+
+
+def test_retries_stop_at_the_deadline(openai_server, resilient):
+    openai_server.reply(429, headers={"Retry-After": "0.5"})
+    provider = resilient()
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError) as raised:
+        provider.get_chat_completion(MESSAGES, Answer, deadline_seconds=2)
+
+    assert isinstance(raised.value.__cause__, openai.RateLimitError)
+    # Gives up as soon as the next wait would pass the deadline, without waiting
+    assert time.monotonic() - start < 2
+    assert time.monotonic() - openai_server.requests[-1][0] < 0.5
+
+
+def test_errors_that_are_not_retried_return_their_reservation(openai_server, resilient):
+    openai_server.reply(400)
+    limiter = RateLimiter(60, 6000)
+
+    for _ in range(5):
+        with pytest.raises(openai.BadRequestError):
+            resilient(limiter).get_chat_completion(MESSAGES, Answer, max_tokens=100)
+
+    assert len(openai_server.requests) == 5
+    assert _is_full(limiter)
+
+
+def test_attempts_that_miss_the_deadline_return_their_reservation():
+    limiter = RateLimiter(60, 6000)
+    limiter.tokens.take(6000)
+    provider = ResilientLlmProvider(BrokenProvider(), limiter)
+
+    for _ in range(20):
+        with pytest.raises(DeadlineExceededError):
+            provider.get_chat_completion(MESSAGES, max_tokens=100, deadline_seconds=0.5)
+
+    # Only the tokens taken before the calls are still missing
+    assert limiter.requests._tokens == pytest.approx(60, abs=0.1)
+    assert limiter.tokens._tokens == pytest.approx(0, abs=50)
+
+
+def test_failed_async_calls_and_streams_return_their_reservation():
+    limiter = RateLimiter(60, 6000)
+    provider = ResilientAsyncLlmProvider(BrokenAsyncProvider(), limiter)
+
+    async def fail():
+        with pytest.raises(ValueError):
+            await provider.get_chat_completion(MESSAGES, max_tokens=100)
+        with pytest.raises(ValueError):
+            async for _ in provider.stream_chat_completion(MESSAGES, max_tokens=100):
+                pass
+
+    for _ in range(5):
+        asyncio.run(fail())
+    assert _is_full(limiter)
+
+
+def test_async_requests_are_retried(openai_server):
+    openai_server.reply(500)
+    openai_server.reply(content={"ok": True})
+    client = AsyncOpenAIProvider("test-key", "test", max_retries=0)
+    provider = ResilientAsyncLlmProvider(
+        client, RateLimiter(1000, 1_000_000), RetryPolicy(base_delay=0.01)
+    )
+
+    async def check():
+        try:
+            return await provider.get_chat_completion(MESSAGES, Answer)
+        finally:
+            await client.client.close()
+
+    response = asyncio.run(check())
+
+    assert response.dict_response.ok
+    assert len(openai_server.requests) == 2
@@ -0,0 +1,95 @@
+import json
+
+import pandas as pd
+import pytest
+
+from polyglot.controllers.user_controller import UserController
+from polyglot.controllers.vocabulary_controller import VocabularyController
+from polyglot.services.migrations import (
+    SETTINGS_VERSION,
+    VOCABULARY_VERSION,
+    migrate_settings,
+)
+from polyglot.services.vocabulary_storage import create_vocabulary_storage
+
+# A vocabulary.csv from before versioning: options in one column, written as
+# a Python list, and only the stats that existed back then
+LEGACY_CSV = """\
+word,translation,example,example_translation,times_practiced,topic,level,sentence_to_fill,sentence_to_fill_translation,options,correct_answer
+casa,house,La casa es grande.,The house is big.,3,Home,A1,La ___ es grande.,The house is big.,"['casa', 'perro', 'gato', 'mesa']",casa
+perro,dog,El perro ladra.,The dog barks.,,Animals,A1,El ___ ladra.,The dog barks.,"['perro', 'casa', 'gato', 'mesa']",perro
+1984,nineteen eighty-four,Leí 1984.,I read 1984.,0,Books,B1,Leí ___.,I read 1984.,"['1984', 'casa', 'gato', 'mesa']",1984
+"""
+
+
+def _write_settings(data_dir, **settings):
+    (data_dir / "user_settings.json").write_text(json.dumps(settings))
+
+
+def _open_vocabulary(backend: str):
+    """Load the vocabulary the way the app does and return it with its storage"""
+    user = UserController()
+    controller = VocabularyController(user)
+    vocabulary = controller.vocabulary.set_index("word")
+    storage = controller.storage
+    controller.close()
+    user.close()
+    return vocabulary, storage
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_legacy_csv_is_migrated_once(backend, home):
+    (home / "vocabulary.csv").write_text(LEGACY_CSV)
+    _write_settings(home, target_language="Spanish", storage_backend=backend)
+
+    vocabulary, storage = _open_vocabulary(backend)
+
+    assert vocabulary.index.tolist() == ["casa", "perro", "1984"]
+    assert vocabulary["times_practiced"].tolist() == [3, 0, 0]
+    assert vocabulary["correct_answers"].tolist() == [0, 0, 0]
+    assert vocabulary["viewed"].tolist() == [False, False, False]
+    assert vocabulary["last_practiced"].notna().all()
+    # Only the practiced word is due, as of its last practice
+    assert vocabulary.loc["casa", "due"] == vocabulary.loc["casa", "last_practiced"]
+    assert vocabulary.loc[["perro", "1984"], "due"].isna().all()
+    assert vocabulary["ease"].tolist() == [2.5, 2.5, 2.5]
+    assert vocabulary.loc["1984", "correct_answer"] == "1984"
+    assert storage.read_schema_version() == VOCABULARY_VERSION
+
+    # The migrated vocabulary was saved, so a restart loads it unchanged
+    restarted = create_vocabulary_storage(backend, home)
+    reloaded = restarted.load().set_index("word")
+    assert restarted.read_schema_version() == VOCABULARY_VERSION
+    assert reloaded["times_practiced"].tolist() == [3, 0, 0]
+    pd.testing.assert_series_equal(
+        reloaded["last_practiced"], vocabulary["last_practiced"]
+    )
+    details = restarted.load_details(["casa"]) if restarted.lazy_details else reloaded
+    assert details.loc["casa", "options"] == ["casa", "perro", "gato", "mesa"]
+
+
+def test_unversioned_settings_get_every_default(home):
+    _write_settings(home, target_language="Spanish", words_per_day=3)
+
+    user = UserController()
+    user.close()
+
+    saved = json.loads((home / "user_settings.json").read_text())
+    assert saved["schema_version"] == SETTINGS_VERSION
+    assert saved["words_per_day"] == 3
+    assert saved["storage_backend"] == "csv"
+    assert saved["selection_strategy"] == "balanced"
+    assert saved["translation_grading"] == "each"
+    assert saved["strip_articles"] is False
+
+
+def test_settings_migrations_keep_existing_values():
+    settings = migrate_settings(
+        {"translation_grading": "at_end", "strip_articles": True, "schema_version": 3},
+        3,
+    )
+    assert settings == {
+        "translation_grading": "at_end",
+        "strip_articles": True,
+        "schema_version": SETTINGS_VERSION,
+    }
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+from polyglot.controllers.user_controller import UserController
+from polyglot.controllers.vocabulary_controller import VocabularyController
+
+COMMENT = (
+    "Well done, the word order is right and the verb sits at the end of the "
+    "clause. You could also use 'gern' to sound more natural."
+)
+
+
+@pytest.fixture
+def controller(home, openai_server, monkeypatch):
+    """A VocabularyController whose LLM requests go to openai_server"""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    (home / "user_settings.json").write_text(
+        json.dumps({"native_language": "English", "target_language": "German"})
+    )
+    user = UserController()
+    controller = VocabularyController(user)
+    yield controller
+    controller.close()
+    user.close()
+
+
+def _stream_check(controller: VocabularyController) -> list:
+    """Collect the updates of one streamed translation check"""
+
+    async def collect():
+        try:
+            return [
+                update
+                async for update in controller.stream_sentence_translation_check(
+                    "I like to read.", "Ich lese gern.", "English", "German"
+                )
+            ]
+        finally:
+            # Cached > resilient > OpenAI provider; its client belongs to this loop
+            await controller.async_llm_provider.provider.provider.client.close()
+
+    return asyncio.run(collect())
+
+
+def test_verdict_arrives_before_the_comment_is_complete(controller, openai_server):
+    openai_server.reply(content={"is_correct": True, "comment": COMMENT})
+
+    updates = _stream_check(controller)
+
+    assert updates[-1] == {"is_correct": True, "comment": COMMENT}
+    first_verdict = next(u for u in updates if u["is_correct"] is not None)
+    assert len(first_verdict["comment"]) < len(COMMENT)
+    # The comment only ever grows, so the label can be updated in place
+    assert all(COMMENT.startswith(update["comment"]) for update in updates)
+    assert len(updates) > 10
+
+
+def test_repeated_check_is_answered_from_the_cache(controller, openai_server):
+    openai_server.reply(content={"is_correct": False, "comment": COMMENT})
+    _stream_check(controller)
+
+    updates = _stream_check(controller)
+
+    assert updates == [{"is_correct": False, "comment": COMMENT}]
+    assert len(openai_server.requests) == 1
+
+
+def test_stream_is_retried_before_anything_arrives(controller, openai_server):
+    openai_server.reply(429, headers={"Retry-After": "0.1"})
+    openai_server.reply(content={"is_correct": True, "comment": COMMENT})
+
+    updates = _stream_check(controller)
+
+    assert updates[-1] == {"is_correct": True, "comment": COMMENT}
+    assert len(openai_server.requests) == 2
+    assert all(body["stream"] for _, body in openai_server.requests)
@@ -0,0 +1,228 @@
+import pandas as pd
+import pytest
+
+from polyglot.services.vocabulary_storage import (
+    DETAIL_COLUMNS,
+    ArrowVocabularyStorage,
+    ChangeKind,
+    CsvVocabularyStorage,
+    SqliteVocabularyStorage,
+    VocabularyChange,
+    create_vocabulary_storage,
+)
+
+BACKENDS = ["csv", "sqlite", pytest.param("arrow", marks=pytest.mark.arrow)]
+SNAPSHOT_BACKENDS = ["csv", pytest.param("arrow", marks=pytest.mark.arrow)]
+
+
+@pytest.fixture(autouse=True)
+def _skip_without_pyarrow(request):
+    if request.node.get_closest_marker("arrow"):
+        pytest.importorskip("pyarrow")
+
+
+def _storage(backend: str, data_dir):
+    return {
+        "csv": CsvVocabularyStorage,
+        "sqlite": SqliteVocabularyStorage,
+        "arrow": ArrowVocabularyStorage,
+    }[backend](data_dir)
+
+
+def _stats(vocabulary: pd.DataFrame, word: str) -> dict:
+    row = vocabulary.set_index("word").loc[word]
+    return {
+        "times_practiced": int(row["times_practiced"]),
+        "correct_answers": int(row["correct_answers"]),
+        "viewed": bool(row["viewed"]),
+    }
+
+
+def _practice(word: str, times_practiced: int) -> VocabularyChange:
+    return VocabularyChange(
+        ChangeKind.UPDATE,
+        {
+            "word": word,
+            "times_practiced": times_practiced,
+            "correct_answers": 1,
+            "viewed": True,
+            "last_practiced": "2024-06-01T10:00:00",
+        },
+    )
+
+
+def _details(storage, vocabulary: pd.DataFrame, words) -> pd.DataFrame:
+    """Get details the way the controller does: from memory unless the storage is lazy"""
+    if storage.lazy_details:
+        return storage.load_details(words)
+    return vocabulary.set_index("word").loc[words, DETAIL_COLUMNS]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trip(backend, tmp_path, vocabulary):
+    words = vocabulary(50)
+    storage = _storage(backend, tmp_path)
+    storage.save(words)
+
+    loaded = _storage(backend, tmp_path).load()
+    assert loaded["word"].tolist() == words["word"].tolist()
+    assert loaded["times_practiced"].tolist() == words["times_practiced"].tolist()
+    assert loaded["viewed"].tolist() == words["viewed"].tolist()
+    assert loaded["last_practiced"].equals(words["last_practiced"])
+    details = _details(storage, loaded, ["word3", "word7"])
+    assert details.loc["word3", "options"] == ["word3", "b", "c", "d"]
+    assert details.loc["word7", "example"] == "An example with word7."
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_changes_survive_restart(backend, tmp_path, vocabulary):
+    storage = _storage(backend, tmp_path)
+    storage.save(vocabulary(20))
+    storage.load()
+    storage.write_changes(
+        None,
+        [
+            _practice("word1", 5),
+            VocabularyChange(ChangeKind.ADD, vocabulary(2, prefix="new")),
+            VocabularyChange(ChangeKind.DELETE, "word2"),
+            _practice("word1", 6),
+        ],
+    )
+
+    restarted = _storage(backend, tmp_path)
+    loaded = restarted.load()
+    assert _stats(loaded, "word1") == {
+        "times_practiced": 6,
+        "correct_answers": 1,
+        "viewed": True,
+    }
+    assert "word2" not in set(loaded["word"])
+    assert {"new0", "new1"} <= set(loaded["word"])
+    if restarted.lazy_details:
+        assert restarted.load_details(["new1"]).loc["new1", "example"] == (
+            "An example with new1."
+        )
+
+
+@pytest.mark.parametrize("backend", SNAPSHOT_BACKENDS)
+def test_stat_updates_only_append_to_the_journal(backend, tmp_path, vocabulary):
+    storage = _storage(backend, tmp_path)
+    storage.save(vocabulary(100))
+    storage.load()
+    snapshot = storage.snapshot_file.read_bytes()
+
+    storage.write_changes(None, [_practice("word4", 3), _practice("word5", 1)])
+
+    assert storage.snapshot_file.read_bytes() == snapshot
+    assert len(storage.journal.path.read_text().splitlines()) == 2
+
+
+@pytest.mark.parametrize("backend", SNAPSHOT_BACKENDS)
+def test_torn_journal_line_is_skipped(backend, tmp_path, vocabulary):
+    storage = _storage(backend, tmp_path)
+    storage.save(vocabulary(10))
+    storage.load()
+    storage.write_changes(None, [_practice("word1", 4)])
+    # A crash in the middle of an append leaves half a record behind
+    with open(storage.journal.path, "a", encoding="utf-8") as f:
+        f.write('{"word": "word2", "times_pr')
+
+    loaded = _storage(backend, tmp_path).load()
+    assert _stats(loaded, "word1")["times_practiced"] == 4
+    assert _stats(loaded, "word2")["times_practiced"] == 0
+
+
+@pytest.mark.parametrize("backend", SNAPSHOT_BACKENDS)
+def test_unfinished_compaction_is_replayed(backend, tmp_path, vocabulary):
+    storage = _storage(backend, tmp_path)
+    storage.save(vocabulary(10))
+    storage.load()
+    storage.write_changes(None, [_practice("word1", 4)])
+    # Crash after the journal was moved aside, before the snapshot was written
+    storage.journal.rotate()
+    storage.write_changes(None, [_practice("word2", 7)])
+
+    restarted = _storage(backend, tmp_path)
+    loaded = restarted.load()
+    assert _stats(loaded, "word1")["times_practiced"] == 4
+    assert _stats(loaded, "word2")["times_practiced"] == 7
+    assert restarted.journal.record_count == 2
+
+
+@pytest.mark.parametrize("backend", SNAPSHOT_BACKENDS)
+def test_compaction_folds_the_journal_into_the_snapshot(backend, tmp_path, vocabulary):
+    words = vocabulary(30)
+    storage = _storage(backend, tmp_path)
+    storage.save(words)
+    storage.load()
+    storage.journal.compaction_threshold = 5
+
+    added = vocabulary(3, prefix="new")
+    words = pd.concat(
+        [words[words["word"] != "word0"], added], ignore_index=True
+    ).astype(words.dtypes.to_dict())
+    words.loc[words["word"] == "word1", "times_practiced"] = 9
+    changes = [
+        _practice("word1", 9),
+        VocabularyChange(ChangeKind.DELETE, "word0"),
+        VocabularyChange(ChangeKind.ADD, added),
+    ]
+    assert storage.needs_snapshot(changes)
+    storage.write_changes(words, changes)
+
+    assert not storage.journal.path.exists()
+    assert not storage.journal.rotated_path.exists()
+    restarted = _storage(backend, tmp_path)
+    loaded = restarted.load()
+    assert loaded["word"].tolist() == words["word"].tolist()
+    assert _stats(loaded, "word1")["times_practiced"] == 9
+    if restarted.lazy_details:
+        details = restarted.load_details(["new2", "word0"])
+        assert details.index.tolist() == ["new2"]
+
+
+@pytest.mark.arrow
+def test_arrow_adds_do_not_rewrite_the_details_file(tmp_path, vocabulary):
+    storage = ArrowVocabularyStorage(tmp_path)
+    storage.save(vocabulary(100))
+    storage.load()
+    details = storage.details_file.read_bytes()
+
+    storage.write_changes(
+        None,
+        [
+            VocabularyChange(ChangeKind.ADD, vocabulary(1, prefix="new")),
+            VocabularyChange(ChangeKind.DELETE, "word5"),
+        ],
+    )
+
+    assert storage.details_file.read_bytes() == details
+    loaded = storage.load_details(["new0", "word5", "word6"])
+    assert sorted(loaded.index) == ["new0", "word6"]
+
+
+def test_sqlite_interrupted_import_is_retried(tmp_path, vocabulary, monkeypatch):
+    csv_storage = CsvVocabularyStorage(tmp_path)
+    csv_storage.save(vocabulary(40))
+    csv_storage.write_schema_version(2)
+
+    def interrupted(self, words):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(SqliteVocabularyStorage, "_replace_all", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            create_vocabulary_storage("sqlite", tmp_path)
+    assert (tmp_path / "vocabulary.sqlite").exists()
+
+    storage = create_vocabulary_storage("sqlite", tmp_path)
+    assert storage.exists()
+    assert len(storage.load()) == 40
+    assert storage.read_schema_version() == 2
+
+
+def test_sqlite_empty_database_does_not_count_as_existing(tmp_path):
+    storage = SqliteVocabularyStorage(tmp_path)
+    assert not storage.exists()
+    storage.write_schema_version(2)
+    assert storage.exists()